@@ -15,29 +15,43 @@ Usage:
     uvicorn api:app --host 0.0.0.0 --port 8000
 """
 
-import json
+import asyncio
 import logging
 import os
 import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, cast
+from dataclasses import dataclass
+from typing import AsyncGenerator
 
 from dotenv import load_dotenv
 
 # Load .env BEFORE any MAF/OTel imports read environment variables
 load_dotenv()
 
+import anyio
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from pydantic import BaseModel
-from sse_starlette.sse import EventSourceResponse
+from opentelemetry.propagate import extract
+from pydantic import BaseModel, Field
 
-from agent_framework import AgentExecutorResponse, Message
 from agent_framework_foundry_local import FoundryLocalClient
 
-from src.config import get_settings
+from src.config import Settings, get_settings
+from src.events import (
+    EVENT_HANDLERS,
+    FRAME_DONE,
+    FRAME_END,
+    FRAME_ERROR,
+    FRAME_OUTPUT,
+    FRAME_STATUS,
+    FRAME_WORKFLOW_BUILT,
+    StreamState,
+)
+from src.sse import accepts_gzip, gzip_frames, relay_frames
 from src.telemetry import setup_telemetry, shutdown_telemetry, trace_workflow
 from src.workflows.travel_planner import build_travel_planner_workflow
 
@@ -53,22 +67,50 @@ logging.basicConfig(
 logger = logging.getLogger("travel_planner.api")
 
 
+# ──────────────────────────────────────────────────────────────
+# SSE Framing
+# ──────────────────────────────────────────────────────────────
+
+# Frames (built in src/events.py as `event: <type>\ndata: <orjson>\n\n` bytes) are streamed
+# directly, skipping sse-starlette's per-event dict formatting and re-encoding.
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive",
+}
+
+
 # ──────────────────────────────────────────────────────────────
 # Request/Response Models
 # ──────────────────────────────────────────────────────────────
 
 class PlanRequest(BaseModel):
     """Request body for the /api/plan endpoint."""
-    query: str
+    query: str = Field(..., min_length=1)
 
 
 # ──────────────────────────────────────────────────────────────
 # Application State
 # ──────────────────────────────────────────────────────────────
 
-# Holds the shared FoundryLocalClient and settings across requests.
-# Initialized during lifespan startup.
-_app_state: dict = {}
+@dataclass(slots=True, frozen=True)
+class AppState:
+    """Shared FoundryLocalClient and settings, stored as `app.state.ctx`.
+
+    `app.state.ctx` is None until the background bootstrap task (stored as
+    `app.state.bootstrap`) has finished creating the client.
+    """
+
+    client: FoundryLocalClient
+    settings: Settings
+
+
+def get_app_state(request: Request) -> AppState:
+    """Dependency returning the ready AppState, or 503 while still bootstrapping."""
+    ctx: AppState | None = request.app.state.ctx
+    if ctx is None:
+        raise HTTPException(status_code=503, detail="Service not ready — client not initialized")
+    return ctx
 
 
 # ──────────────────────────────────────────────────────────────
@@ -78,32 +120,50 @@ _app_state: dict = {}
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan: initialize GPU client and telemetry at startup,
-    clean up on shutdown."""
+    clean up on shutdown.
+
+    The FoundryLocal bootstrap (GPU init + model preparation) is synchronous and
+    can take tens of seconds, so it runs in a worker thread from a background
+    task. The server starts accepting requests immediately: /api/health and
+    /api/plan answer 503 until the client is ready. A failed bootstrap leaves
+    `app.state.ctx` unset, so /api/health keeps answering 503 "unhealthy" and
+    the orchestrator can restart or replace the process.
+    """
     settings = get_settings()
 
     # ── Startup ─────────────────────────────────────────────
     logger.info("Setting up telemetry (OTLP → %s)", settings.otel_endpoint)
     setup_telemetry(service_name=settings.otel_service_name)
 
-    logger.info("Initializing FoundryLocal client with model: %s", settings.foundry_model_id)
-    client = FoundryLocalClient(
-        model_id=settings.foundry_model_id,
-        bootstrap=True,
-        prepare_model=True,
-    )
-    logger.info("FoundryLocal ready — endpoint: %s", client.manager.endpoint)
+    async def bootstrap_client() -> None:
+        logger.info("Initializing FoundryLocal client with model: %s", settings.foundry_model_id)
+        client = await anyio.to_thread.run_sync(
+            lambda: FoundryLocalClient(
+                model_id=settings.foundry_model_id,
+                bootstrap=True,
+                prepare_model=True,
+            )
+        )
+        logger.info("FoundryLocal ready — endpoint: %s", client.manager.endpoint)
+        app.state.ctx = AppState(client=client, settings=settings)
+        logger.info("API server ready — FoundryLocal + Telemetry initialized")
 
-    _app_state["client"] = client
-    _app_state["settings"] = settings
+    def log_bootstrap_failure(task: asyncio.Task[None]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("FoundryLocal bootstrap failed", exc_info=task.exception())
 
-    logger.info("API server ready — FoundryLocal + Telemetry initialized")
+    app.state.ctx = None
+    bootstrap = asyncio.create_task(bootstrap_client())
+    bootstrap.add_done_callback(log_bootstrap_failure)
+    app.state.bootstrap = bootstrap
 
     yield
 
     # ── Shutdown ────────────────────────────────────────────
+    bootstrap.cancel()
     logger.info("Shutting down telemetry...")
     shutdown_telemetry()
-    _app_state.clear()
+    app.state.ctx = None
 
 
 # ──────────────────────────────────────────────────────────────
@@ -131,8 +191,13 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Auto-instrument FastAPI with OpenTelemetry
-FastAPIInstrumentor.instrument_app(app)
+# Auto-instrument FastAPI with OpenTelemetry. The long-lived SSE route is excluded
+# so a single server span is not held open (and mutated) for the whole stream;
+# /api/plan is traced manually via trace_workflow + per-agent spans instead.
+FastAPIInstrumentor.instrument_app(
+    app,
+    excluded_urls=os.getenv("OTEL_PYTHON_FASTAPI_EXCLUDED_URLS", "api/plan"),
+)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -140,19 +205,36 @@ FastAPIInstrumentor.instrument_app(app)
 # ──────────────────────────────────────────────────────────────
 
 @app.get("/api/health")
-async def health() -> dict:
-    """Healthcheck endpoint."""
+async def health(request: Request, response: Response) -> dict:
+    """Healthcheck endpoint.
+
+    Answers 503 until FoundryLocal is ready, reporting "starting" while it is
+    still bootstrapping and "unhealthy" if the bootstrap failed.
+    """
+    # Both attributes are unset until the lifespan has started
+    state = request.app.state
+    ctx: AppState | None = getattr(state, "ctx", None)
+    if ctx is not None:
+        return {
+            "status": "healthy",
+            "service": "travel-planner-api",
+            "model": ctx.settings.foundry_model_id,
+        }
+    bootstrap: asyncio.Task[None] | None = getattr(state, "bootstrap", None)
+    response.status_code = 503
     return {
-        "status": "healthy",
+        "status": "unhealthy" if bootstrap is not None and bootstrap.done() else "starting",
         "service": "travel-planner-api",
-        "model": _app_state.get("settings", {}).foundry_model_id
-        if _app_state.get("settings")
-        else "not initialized",
+        "model": "not initialized",
     }
 
 
 @app.post("/api/plan")
-async def plan_trip(request: PlanRequest) -> EventSourceResponse:
+async def plan_trip(
+    request: PlanRequest,
+    http_request: Request,
+    ctx: AppState = Depends(get_app_state),
+) -> StreamingResponse:
     """Execute the Travel Planner workflow and stream events via SSE.
 
     The SSE stream emits the following event types:
@@ -163,128 +245,86 @@ async def plan_trip(request: PlanRequest) -> EventSourceResponse:
         - error:          Error during workflow execution
         - done:           Stream complete signal
     """
-    if not request.query.strip():
+    # Empty strings are rejected by the model; only whitespace-only queries reach here
+    if request.query.isspace():
         raise HTTPException(status_code=422, detail="Query must not be empty")
 
-    client = _app_state.get("client")
-    settings = _app_state.get("settings")
+    client = ctx.client
+    settings = ctx.settings
 
-    if not client or not settings:
-        raise HTTPException(status_code=503, detail="Service not ready — client not initialized")
+    # The route is not auto-instrumented, so continue the browser's trace here
+    parent_context = extract(http_request.headers)
 
-    async def event_generator() -> AsyncGenerator[dict, None]:
-        """Generate SSE events from the workflow execution."""
+    async def event_generator() -> AsyncGenerator[bytes, None]:
+        """Generate pre-encoded SSE frames from the workflow execution."""
+        state = StreamState()
         try:
-            # Build workflow per-request (agents are lightweight, MCP tool needs fresh connection)
+            # Build workflow per-request (LLM-only agents are cached, MCP tool needs fresh connection)
             workflow, mcp_tool = build_travel_planner_workflow(
                 client=client,
                 mcp_server_url=settings.mcp_server_url,
             )
 
-            yield {
-                "event": "status",
-                "data": json.dumps({"message": "Workflow built — starting execution"}),
-            }
-
-            # Track messages already sent to avoid duplicates
-            # (intermediate_outputs=True emits cumulative output after each agent)
-            sent_message_count = 0
+            yield FRAME_WORKFLOW_BUILT
 
-            with trace_workflow("travel_planner", request.query):
+            with trace_workflow("travel_planner", request.query, context=parent_context):
                 async with mcp_tool:
-                    tool_names = [f.name for f in mcp_tool.functions]
-                    logger.info("MCP tools available: %s", ", ".join(tool_names))
+                    # A tuple serves both the log record and orjson's native sequence encoder
+                    tool_names = tuple(f.name for f in mcp_tool.functions)
+                    logger.debug("MCP tools available: %s", tool_names)
 
-                    yield {
-                        "event": "status",
-                        "data": json.dumps({
-                            "message": "MCP connected",
-                            "tools": tool_names,
-                        }),
-                    }
+                    yield (
+                        FRAME_STATUS
+                        + orjson.dumps({"message": "MCP connected", "tools": tool_names})
+                        + FRAME_END
+                    )
 
                     # Stream workflow events
-                    start_time = time.perf_counter()
-                    current_agent = None
+                    start_ns = time.monotonic_ns()
+                    handlers = EVENT_HANDLERS
                     async for event in workflow.run(request.query, stream=True):
-                        if event.type == "status":
-                            yield {
-                                "event": "status",
-                                "data": json.dumps({"state": str(event.state)}),
-                            }
-                        elif event.type == "executor_invoked":
-                            exec_name = getattr(event, "executor_id", "unknown")
-                            logger.info("Agent started: %s", exec_name)
-                            current_agent = exec_name
-                            yield {
-                                "event": "agent_started",
-                                "data": json.dumps({"agent": exec_name}),
-                            }
-                        elif event.type == "executor_completed":
-                            exec_name = getattr(event, "executor_id", "unknown")
-                            logger.info("Agent completed: %s", exec_name)
-                            yield {
-                                "event": "agent_completed",
-                                "data": json.dumps({"agent": exec_name}),
-                            }
-                        elif event.type == "output":
-                            # With intermediate_outputs=True, intermediate events carry
-                            # AgentExecutorResponse (with .full_conversation), while the
-                            # final event carries list[Message]. Extract new messages only.
-                            output_data = event.data
-                            if output_data:
-                                messages: list[Message]
-                                if isinstance(output_data, AgentExecutorResponse):
-                                    messages = output_data.full_conversation or []
-                                elif isinstance(output_data, list):
-                                    messages = cast(list[Message], output_data)
-                                else:
-                                    logger.warning("Unexpected output type: %s", type(output_data).__name__)
-                                    continue
-
-                                new_messages = [
-                                    m for m in messages[sent_message_count:]
-                                    if m.role.upper() == "ASSISTANT"
-                                ]
-                                for msg in new_messages:
-                                    yield {
-                                        "event": "message",
-                                        "data": json.dumps({
-                                            "role": msg.role,
-                                            "author": msg.author_name or "Assistant",
-                                            "text": msg.text,
-                                        }),
-                                    }
-                                sent_message_count = len(messages)
+                        handler = handlers.get(event.type)
+                        if handler is not None:
+                            for frame in handler(event, state):
+                                yield frame
 
                     # Send final output summary after stream ends
-                    duration = round(time.perf_counter() - start_time, 2)
-                    yield {
-                        "event": "output",
-                        "data": json.dumps({
+                    duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+                    yield (
+                        FRAME_OUTPUT
+                        + orjson.dumps({
                             "message": "Workflow complete",
-                            "duration_seconds": duration,
-                            "agent_count": sent_message_count,
-                        }),
-                    }
+                            "duration_seconds": duration_ms / 1000,
+                            "agent_count": state.sent_idx,
+                        })
+                        + FRAME_END
+                    )
 
             # Signal stream end
-            yield {
-                "event": "done",
-                "data": json.dumps({"message": "Stream complete"}),
-            }
+            yield FRAME_DONE
 
         except Exception as e:
             logger.exception("Error during workflow execution")
-            yield {
-                "event": "error",
-                "data": json.dumps({
-                    "error": str(e),
-                    "type": type(e).__name__,
-                }),
-            }
+            yield (
+                FRAME_ERROR
+                + orjson.dumps({"error": str(e), "type": type(e).__name__})
+                + FRAME_END
+            )
+        finally:
+            state.end_agent_spans()
+
+    body = relay_frames(
+        event_generator(),
+        max_queue_size=settings.sse_max_queue_size,
+        queue_timeout=settings.sse_queue_timeout,
+        flush_interval_ms=settings.sse_flush_interval_ms,
+    )
+    headers = _SSE_HEADERS
+    if settings.sse_compress and accepts_gzip(http_request.headers.get("accept-encoding", "")):
+        body = gzip_frames(body)
+        headers = {**_SSE_HEADERS, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
 
-    return EventSourceResponse(event_generator())
+    return StreamingResponse(body, media_type="text/event-stream", headers=headers)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -305,9 +345,22 @@ if __name__ == "__main__":
     print(f"  Aspire UI: http://localhost:18888")
     print("=" * 70 + "\n")
 
+    # uvloop + httptools come with uvicorn[standard]; uvloop has no Windows support
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+
     uvicorn.run(
         "api:app",
         host=settings.api_host,
         port=settings.api_port,
         log_level="info",
+        loop=loop,
+        http="httptools",
+        limit_concurrency=settings.uvicorn_limit_concurrency,
+        backlog=2048,
+        workers=settings.uvicorn_workers,
     )
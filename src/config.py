@@ -23,6 +23,12 @@ class Settings:
         mcp_server_url: URL of the FastMCP HTTP server (e.g. "http://localhost:8090/mcp").
         otel_endpoint: OTLP gRPC endpoint for telemetry export (e.g. "http://localhost:4317").
         otel_service_name: Service name tag for telemetry spans.
+        sse_max_queue_size: Max SSE frames buffered per connection before backpressure applies.
+        sse_queue_timeout: Seconds a full SSE queue may stay blocked before the client is dropped.
+        sse_flush_interval_ms: Window for coalescing SSE frames into one write (0 = no waiting).
+        sse_compress: Gzip the SSE stream for clients that accept it (off by default; enable over WAN).
+        uvicorn_workers: Number of uvicorn worker processes for the API server.
+        uvicorn_limit_concurrency: Max concurrent connections before uvicorn answers 503.
     """
 
     foundry_model_id: str = field(
@@ -46,6 +52,24 @@ class Settings:
     api_port: int = field(
         default_factory=lambda: int(os.getenv("API_PORT", "8000"))
     )
+    sse_max_queue_size: int = field(
+        default_factory=lambda: int(os.getenv("SSE_MAX_QUEUE_SIZE", "256"))
+    )
+    sse_queue_timeout: float = field(
+        default_factory=lambda: float(os.getenv("SSE_QUEUE_TIMEOUT", "30"))
+    )
+    sse_flush_interval_ms: int = field(
+        default_factory=lambda: int(os.getenv("SSE_FLUSH_INTERVAL_MS", "10"))
+    )
+    sse_compress: bool = field(
+        default_factory=lambda: os.getenv("SSE_COMPRESS", "0").lower() in ("1", "true", "yes")
+    )
+    uvicorn_workers: int = field(
+        default_factory=lambda: int(os.getenv("UVICORN_WORKERS", "1"))
+    )
+    uvicorn_limit_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("UVICORN_LIMIT_CONCURRENCY", "1024"))
+    )
 
 
 def get_settings() -> Settings:
@@ -0,0 +1,139 @@
+"""
+Workflow Event Handlers
+=======================
+Translate Agent Framework workflow events into pre-encoded SSE frames for the
+/api/plan stream, with the per-stream bookkeeping (sent offset, frame cache,
+open agent spans) the handlers share.
+
+Events are read by attribute only and nothing is imported from the Agent
+Framework at runtime, so the handlers can be driven with fake events in tests.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Iterator, cast
+
+import orjson
+from opentelemetry.trace import Span
+
+from src.telemetry import start_agent_span
+
+if TYPE_CHECKING:
+    from agent_framework import Message
+
+logger = logging.getLogger(__name__)
+
+# Frames are built as bytes (`event: <type>\ndata: <orjson>\n\n`). Prefixes are
+# built once at import; per event only the JSON payload is allocated and joined
+# as `prefix + payload + FRAME_END`.
+FRAME_STATUS = b"event: status\ndata: "
+FRAME_AGENT_STARTED = b"event: agent_started\ndata: "
+FRAME_AGENT_COMPLETED = b"event: agent_completed\ndata: "
+FRAME_MESSAGE = b"event: message\ndata: "
+FRAME_OUTPUT = b"event: output\ndata: "
+FRAME_ERROR = b"event: error\ndata: "
+FRAME_END = b"\n\n"
+
+# Frames with constant payloads are fully precomputed
+FRAME_WORKFLOW_BUILT = (
+    FRAME_STATUS + orjson.dumps({"message": "Workflow built — starting execution"}) + FRAME_END
+)
+FRAME_DONE = b"event: done\ndata: " + orjson.dumps({"message": "Stream complete"}) + FRAME_END
+
+# Only assistant turns are streamed as `message` events. Roles come from a
+# small closed set of strings, so a set lookup avoids a .lower() copy per message.
+_ASSISTANT_ROLES = frozenset({"assistant", "ASSISTANT", "Assistant"})
+
+
+class StreamState:
+    """Per-stream bookkeeping shared by the workflow event handlers."""
+
+    __slots__ = ("sent_idx", "msg_cache", "agent_spans")
+
+    def __init__(self) -> None:
+        # Index of the first conversation message not yet sent
+        # (intermediate_outputs=True emits cumulative output after each agent)
+        self.sent_idx = 0
+        # Encoded `message` frames keyed by id(msg); the message is kept in the
+        # value so its id cannot be reused by another object mid-stream
+        self.msg_cache: dict[int, tuple[Message, bytes]] = {}
+        # Open agent.<name> spans, ended when the matching executor completes
+        self.agent_spans: dict[str, Span] = {}
+
+    def end_agent_spans(self) -> None:
+        """End spans for agents that never reported completion (error/disconnect)."""
+        for span in self.agent_spans.values():
+            span.end()
+        self.agent_spans.clear()
+
+
+def _h_status(event: Any, state: StreamState) -> Iterator[bytes]:
+    yield FRAME_STATUS + orjson.dumps({"state": str(event.state)}) + FRAME_END
+
+
+def _h_invoked(event: Any, state: StreamState) -> Iterator[bytes]:
+    exec_name = event.executor_id
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Agent started: %s", exec_name)
+    # A re-invoked executor replaces its span; end the previous one so it is not leaked
+    previous = state.agent_spans.get(exec_name)
+    if previous is not None:
+        previous.end()
+    state.agent_spans[exec_name] = start_agent_span(exec_name)
+    yield FRAME_AGENT_STARTED + orjson.dumps({"agent": exec_name}) + FRAME_END
+
+
+def _h_completed(event: Any, state: StreamState) -> Iterator[bytes]:
+    exec_name = event.executor_id
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Agent completed: %s", exec_name)
+    span = state.agent_spans.pop(exec_name, None)
+    if span is not None:
+        span.end()
+    yield FRAME_AGENT_COMPLETED + orjson.dumps({"agent": exec_name}) + FRAME_END
+
+
+def _h_output(event: Any, state: StreamState) -> Iterator[bytes]:
+    # With intermediate_outputs=True, intermediate events carry
+    # AgentExecutorResponse (with .full_conversation), while the
+    # final event carries list[Message]. Extract new messages only.
+    output_data = event.data
+    if not output_data:
+        return
+    messages: list[Message]
+    if isinstance(output_data, list):
+        messages = cast("list[Message]", output_data)
+    elif hasattr(output_data, "full_conversation"):
+        messages = output_data.full_conversation or []
+    else:
+        logger.warning("Unexpected output type: %s", type(output_data).__name__)
+        return
+
+    msg_cache = state.msg_cache
+    for i in range(state.sent_idx, len(messages)):
+        msg = messages[i]
+        if msg.role not in _ASSISTANT_ROLES:
+            continue
+        cached = msg_cache.get(id(msg))
+        if cached is None:
+            cached = msg_cache[id(msg)] = (
+                msg,
+                FRAME_MESSAGE
+                + orjson.dumps({
+                    "role": msg.role,
+                    "author": msg.author_name or "Assistant",
+                    "text": msg.text,
+                })
+                + FRAME_END,
+            )
+        yield cached[1]
+    state.sent_idx = len(messages)
+
+
+# Workflow event type → handler yielding the SSE frames for that event.
+# Unlisted event types are not forwarded to the client.
+EVENT_HANDLERS: dict[str, Callable[[Any, StreamState], Iterator[bytes]]] = {
+    "status": _h_status,
+    "executor_invoked": _h_invoked,
+    "executor_completed": _h_completed,
+    "output": _h_output,
+}
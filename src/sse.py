@@ -0,0 +1,162 @@
+"""
+SSE Transport
+=============
+Transport helpers for the /api/plan Server-Sent Events stream: a bounded relay
+that coalesces frames and sends heartbeats, and a sync-flushed gzip encoder.
+
+Both work on plain async byte iterators and import nothing from the Agent
+Framework or FastAPI, so they can be exercised directly in tests.
+"""
+
+import asyncio
+import logging
+import zlib
+from contextlib import suppress
+from typing import AsyncGenerator
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+# SSE comment frame sent while agents are busy so proxies keep the stream open
+PING_FRAME = b": ping\n\n"
+HEARTBEAT_INTERVAL_S = 15.0
+
+# Frames arriving back-to-back are coalesced into one write of at most this size
+FLUSH_MAX_BYTES = 8 * 1024
+
+# Low zlib level: SSE payloads are repetitive JSON, so most of the ratio comes cheap
+_COMPRESS_LEVEL = 3
+
+
+class SlowClientError(Exception):
+    """Raised when an SSE client stops draining its stream and the frame queue stays full."""
+
+
+async def relay_frames(
+    frames: AsyncGenerator[bytes, None],
+    *,
+    max_queue_size: int,
+    queue_timeout: float,
+    flush_interval_ms: int,
+    heartbeat_interval: float = HEARTBEAT_INTERVAL_S,
+) -> AsyncGenerator[bytes, None]:
+    """Relay SSE frames through a bounded memory stream, emitting a ping while the source is idle.
+
+    The source is drained by a single producer task so the context managers it
+    holds open (workflow span, MCP session) enter and exit in the same task,
+    and workflow progress is not stalled by the client's write speed.
+    When the client stops reading, the stream buffer fills up and the producer blocks;
+    if it stays blocked for `queue_timeout` seconds the workflow is abandoned
+    and the stream is closed instead of buffering without bound.
+
+    Frames that arrive within `flush_interval_ms` of the first one in a batch
+    (e.g. status + agent_started + message) are written as a single chunk of
+    up to FLUSH_MAX_BYTES. A flush interval of 0 only coalesces frames that
+    are already buffered.
+    """
+    send, recv = anyio.create_memory_object_stream[bytes](max_buffer_size=max_queue_size)
+    client_slow = False
+
+    async def put(frame: bytes) -> None:
+        try:
+            with anyio.fail_after(queue_timeout):
+                await send.send(frame)
+        except TimeoutError:
+            pending = send.statistics().current_buffer_used
+            raise SlowClientError(
+                f"{pending} frames pending for more than {queue_timeout}s"
+            ) from None
+
+    async def produce() -> None:
+        nonlocal client_slow
+        try:
+            async with send:
+                async for frame in frames:
+                    await put(frame)
+        except SlowClientError as e:
+            client_slow = True
+            logger.warning("Disconnecting slow SSE client: %s", e)
+        finally:
+            await frames.aclose()
+
+    async def receive(timeout: float) -> bytes | None:
+        """Next frame, or None on timeout; raises EndOfStream once the producer is done."""
+        with anyio.move_on_after(timeout):
+            return await recv.receive()
+        return None
+
+    flush_interval = flush_interval_ms / 1000
+    producer = asyncio.create_task(produce())
+    async with recv:
+        try:
+            finished = False
+            while not (finished or client_slow):
+                try:
+                    frame = await receive(heartbeat_interval)
+                except anyio.EndOfStream:
+                    break
+                if frame is None:
+                    yield PING_FRAME
+                    continue
+
+                buffer = bytearray(frame)
+                flush_at = anyio.current_time() + flush_interval
+                try:
+                    while len(buffer) < FLUSH_MAX_BYTES:
+                        try:
+                            frame = recv.receive_nowait()
+                        except anyio.WouldBlock:
+                            frame = await receive(flush_at - anyio.current_time())
+                            if frame is None:
+                                break
+                        buffer += frame
+                except anyio.EndOfStream:
+                    finished = True
+                yield bytes(buffer)
+        finally:
+            producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await producer
+
+
+async def gzip_frames(chunks: AsyncGenerator[bytes, None]) -> AsyncGenerator[bytes, None]:
+    """Gzip an SSE byte stream for `Content-Encoding: gzip`.
+
+    Each chunk is sync-flushed so it reaches the client immediately instead of
+    waiting in the compressor (which is why GZipMiddleware skips event streams).
+    """
+    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        await chunks.aclose()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Return True if an Accept-Encoding header allows a gzip response.
+
+    Honours q-values (RFC 9110 §12.5.3): `gzip;q=0` is a refusal, and a
+    wildcard only applies when gzip is not listed explicitly.
+    """
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "x-gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name == "*":
+            wildcard = quality > 0
+        else:
+            return quality > 0
+    return wildcard
@@ -14,6 +14,7 @@ from contextlib import contextmanager
 from typing import Any, Generator
 
 from opentelemetry import metrics, trace
+from opentelemetry.context import Context
 
 logger = logging.getLogger(__name__)
 
@@ -81,12 +82,18 @@ def get_tracer() -> trace.Tracer:
 
 
 @contextmanager
-def trace_workflow(workflow_name: str, query: str) -> Generator[trace.Span, None, None]:
+def trace_workflow(
+    workflow_name: str,
+    query: str,
+    context: Context | None = None,
+) -> Generator[trace.Span, None, None]:
     """Context manager that creates a span for the entire workflow execution.
 
     Args:
         workflow_name: Name of the workflow being executed.
         query: The user query that initiated the workflow.
+        context: Parent context (e.g. extracted from an incoming `traceparent`
+            header). Defaults to the current context.
 
     Yields:
         The active span for additional attribute setting.
@@ -98,6 +105,7 @@ def trace_workflow(workflow_name: str, query: str) -> Generator[trace.Span, None
             "workflow.name": workflow_name,
             "workflow.input": query,
         },
+        context=context,
     ) as span:
         start = time.perf_counter()
         try:
@@ -138,6 +146,24 @@ def trace_agent(agent_name: str, **attributes: Any) -> Generator[trace.Span, Non
                 _agent_duration.record(duration, {"agent.name": agent_name})
 
 
+def start_agent_span(agent_name: str, **attributes: Any) -> trace.Span:
+    """Start a span for an agent whose start and end arrive as separate events.
+
+    Unlike trace_agent, the span is not made current; the caller must call
+    `span.end()` once the agent completes.
+
+    Args:
+        agent_name: Name of the agent being invoked.
+        **attributes: Additional span attributes.
+
+    Returns:
+        The started span.
+    """
+    span_attrs: dict[str, Any] = {"agent.name": agent_name}
+    span_attrs.update(attributes)
+    return get_tracer().start_span(f"agent.{agent_name}", attributes=span_attrs)
+
+
 def record_mcp_tool_call(tool_name: str, server_url: str) -> None:
     """Record an MCP tool invocation metric.
 
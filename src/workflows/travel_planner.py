@@ -13,8 +13,15 @@ Architecture:
         → WeatherAnalyst (MCP tools: weather, time, restaurants)
         → Planner (LLM-only: synthesize into travel plan)
         → Final Output
+
+The tool-free Researcher and Planner agents are created once per client and
+reused; only the MCP-backed WeatherAnalyst and the workflow graph are built per
+call, since each run needs its own MCP connection and a Workflow instance cannot
+execute concurrently.
 """
 
+from functools import lru_cache
+
 from agent_framework import Agent, MCPStreamableHTTPTool
 from agent_framework.orchestrations import SequentialBuilder
 
@@ -25,6 +32,19 @@ from ..agents import (
 )
 
 
+@lru_cache(maxsize=1)
+def _get_llm_only_agents(client: object) -> tuple[Agent, Agent]:
+    """Create (or reuse) the Researcher and Planner agents for a client.
+
+    Args:
+        client: A FoundryLocalClient for creating agents.
+
+    Returns:
+        A tuple of (researcher, planner) agents.
+    """
+    return create_researcher_agent(client), create_planner_agent(client)
+
+
 def build_travel_planner_workflow(
     client: object,
     mcp_server_url: str,
@@ -39,10 +59,9 @@ def build_travel_planner_workflow(
         A tuple of (Workflow, MCPStreamableHTTPTool). The MCP tool must be managed
         as a context manager to keep the connection alive during workflow execution.
     """
-    # Create agents
-    researcher = create_researcher_agent(client)
+    # Researcher/Planner are cached per client; the weather agent owns the MCP tool
+    researcher, planner = _get_llm_only_agents(client)
     weather_analyst, mcp_tool = create_weather_analyst_agent(client, mcp_server_url)
-    planner = create_planner_agent(client)
 
     # Build sequential workflow: Researcher → WeatherAnalyst → Planner
     # intermediate_outputs=True emits output events after each agent completes,
@@ -0,0 +1,29 @@
+"""
+Literal Scanning
+================
+Helper shared by the structural tests that check config and source files for
+many literal needles at once.
+"""
+
+import re
+from typing import AnyStr, Iterable
+
+
+def find_literals(data: AnyStr, literals: Iterable[AnyStr]) -> frozenset[AnyStr]:
+    """Literals present in `data` (str or bytes), found in one regex pass.
+
+    One alternation over the literals, longest first, is tried at every offset,
+    so only the longest literal starting at each offset is reported; literals
+    contained in a reported match (e.g. "aspire-dashboard:" inside
+    "aspire-dashboard:18889") are added back afterwards.
+    """
+    literals = frozenset(literals)
+    if not literals:
+        return literals
+    ordered = sorted(literals, key=len, reverse=True)
+    if isinstance(data, str):
+        pattern = "(?=(" + "|".join(map(re.escape, ordered)) + "))"
+    else:
+        pattern = b"(?=(" + b"|".join(map(re.escape, ordered)) + b"))"
+    matched = set(re.findall(pattern, data))
+    return frozenset(lit for lit in literals if any(lit in m for m in matched))
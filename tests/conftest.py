@@ -0,0 +1,86 @@
+"""
+Shared pytest fixtures.
+
+The web UI files (web_ui/) are read lazily, once per session, the first time
+a test asks for them; sessions that don't select those tests never touch them.
+"""
+
+import os
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+WEB_UI_DIR = pytest.StashKey[Path]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Resolve the web_ui/ directory once per process."""
+    config.stash[WEB_UI_DIR] = Path(__file__).resolve().parent.parent / "web_ui"
+
+
+@pytest.fixture(scope="session")
+def web_ui_dir(request: pytest.FixtureRequest) -> Path:
+    """The web_ui/ directory resolved in pytest_configure."""
+    return request.config.stash[WEB_UI_DIR]
+
+
+@pytest.fixture(scope="session")
+def web_ui_entries(web_ui_dir: Path) -> frozenset[str]:
+    """Names of the regular files in web_ui/, from a single directory listing."""
+    try:
+        with os.scandir(web_ui_dir) as entries:
+            return frozenset(e.name for e in entries if e.is_file())
+    except FileNotFoundError:
+        return frozenset()
+
+
+@pytest.fixture(scope="session")
+def web_ui_file(web_ui_dir: Path) -> Callable[[str], bytes]:
+    """Read a file from web_ui/ as bytes on first use; later calls reuse it.
+
+    The checks only look for ASCII literals, so files are searched as bytes
+    without a UTF-8 decode. A missing or unreadable file fails the tests that
+    need it rather than the whole session.
+    """
+    cache: dict[str, bytes] = {}
+
+    def read(filename: str) -> bytes:
+        if filename not in cache:
+            try:
+                cache[filename] = (web_ui_dir / filename).read_bytes()
+            except OSError as e:
+                pytest.fail(f"web_ui/{filename} could not be read: {e}", pytrace=False)
+        return cache[filename]
+
+    return read
+
+
+@pytest.fixture(scope="session")
+def index_html(web_ui_file: Callable[[str], bytes]) -> bytes:
+    return web_ui_file("index.html")
+
+
+@pytest.fixture(scope="session")
+def app_js(web_ui_file: Callable[[str], bytes]) -> bytes:
+    return web_ui_file("app.js")
+
+
+@pytest.fixture(scope="session")
+def telemetry_js(web_ui_file: Callable[[str], bytes]) -> bytes:
+    return web_ui_file("telemetry.js")
+
+
+@pytest.fixture(scope="session")
+def nginx_conf(web_ui_file: Callable[[str], bytes]) -> bytes:
+    return web_ui_file("nginx.conf")
+
+
+@pytest.fixture(scope="session")
+def web_ui_dockerfile(web_ui_file: Callable[[str], bytes]) -> bytes:
+    return web_ui_file("Dockerfile")
+
+
+@pytest.fixture(scope="session")
+def style_css(web_ui_file: Callable[[str], bytes]) -> bytes:
+    return web_ui_file("style.css")
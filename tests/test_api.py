@@ -7,7 +7,10 @@ and request/response models — without requiring a GPU or live FoundryLocal.
 """
 
 import ast
+import dataclasses
 import os
+from concurrent.futures import Future
+from typing import Any, Iterator
 
 import pytest
 
@@ -64,9 +67,9 @@ class TestApiImports:
         source = _read_api()
         assert "CORSMiddleware" in source
 
-    def test_imports_sse(self) -> None:
+    def test_imports_streaming_response(self) -> None:
         source = _read_api()
-        assert "EventSourceResponse" in source
+        assert "StreamingResponse" in source
 
     def test_imports_opentelemetry_fastapi(self) -> None:
         source = _read_api()
@@ -94,9 +97,11 @@ class TestApiImports:
         assert "FoundryLocalClient" in source
 
     def test_imports_project_modules(self) -> None:
-        """Verify api.py imports from src.config, src.telemetry, src.workflows."""
+        """Verify api.py imports from src.config, src.events, src.sse, src.telemetry, src.workflows."""
         source = _read_api()
         assert "from src.config import" in source
+        assert "from src.events import" in source
+        assert "from src.sse import" in source
         assert "from src.telemetry import" in source
         assert "from src.workflows.travel_planner import" in source
 
@@ -140,6 +145,10 @@ class TestApiModels:
         source = _read_api()
         assert "query: str" in source
 
+    def test_plan_request_rejects_empty_query_at_parse_time(self) -> None:
+        source = _read_api()
+        assert "Field(..., min_length=1)" in source
+
 
 # ──────────────────────────────────────────────────────────────
 # CORS Configuration
@@ -176,11 +185,40 @@ class TestApiSSEEvents:
         "status",
     ])
     def test_sse_event_type_emitted(self, event_type: str) -> None:
-        source = _read_api()
-        assert f'"event": "{event_type}"' in source, (
-            f"SSE event type '{event_type}' must be emitted in api.py"
+        import src.events
+
+        prefix = f"event: {event_type}\n".encode()
+        frames = [v for k, v in vars(src.events).items() if k.startswith("FRAME_")]
+        assert any(frame.startswith(prefix) for frame in frames), (
+            f"SSE event type '{event_type}' must have a frame in src/events.py"
         )
 
+    def test_sse_media_type(self) -> None:
+        source = _read_api()
+        assert 'media_type="text/event-stream"' in source
+
+    def test_sse_disables_proxy_buffering(self) -> None:
+        """Nginx must not buffer the stream, or events arrive in one batch."""
+        source = _read_api()
+        assert '"X-Accel-Buffering": "no"' in source
+
+    def test_sse_queue_is_bounded(self) -> None:
+        """A stalled client must not make the server buffer frames without bound."""
+        source = _read_api()
+        assert "settings.sse_max_queue_size" in source
+        assert "settings.sse_queue_timeout" in source
+
+    def test_sse_stream_goes_through_relay(self) -> None:
+        """Heartbeats, coalescing and backpressure live in src/sse.py (see test_sse.py)."""
+        source = _read_api()
+        assert "relay_frames(" in source
+        assert "settings.sse_flush_interval_ms" in source
+
+    def test_sse_compression_is_configurable(self) -> None:
+        source = _read_api()
+        assert "gzip_frames(" in source
+        assert "settings.sse_compress" in source
+
 
 # ──────────────────────────────────────────────────────────────
 # Telemetry Integration
@@ -191,7 +229,18 @@ class TestApiTelemetry:
 
     def test_fastapi_instrumentor_called(self) -> None:
         source = _read_api()
-        assert "FastAPIInstrumentor.instrument_app(app)" in source
+        assert "FastAPIInstrumentor.instrument_app(" in source
+
+    def test_sse_route_excluded_from_auto_instrumentation(self) -> None:
+        """The long-lived /api/plan stream is traced manually, not by the middleware."""
+        source = _read_api()
+        assert '"api/plan"' in source
+        assert "extract(http_request.headers)" in source
+
+    def test_open_agent_spans_ended_with_stream(self) -> None:
+        """Agents interrupted by an error or disconnect must not leak spans."""
+        source = _read_api()
+        assert "state.end_agent_spans()" in source
 
     def test_setup_telemetry_in_lifespan(self) -> None:
         source = _read_api()
@@ -222,11 +271,88 @@ class TestApiLifespan:
         source = _read_api()
         assert "FoundryLocalClient(" in source
 
+    def test_lifespan_bootstraps_client_off_event_loop(self) -> None:
+        """GPU bootstrap is blocking and must run in a worker thread."""
+        source = _read_api()
+        assert "anyio.to_thread.run_sync(" in source
+
+    def test_shared_state_is_frozen_and_slotted(self) -> None:
+        import api
+
+        ctx = api.AppState(client=object(), settings=api.Settings())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            ctx.client = object()  # type: ignore[misc]
+        assert not hasattr(ctx, "__dict__")
+
+    def test_lifespan_publishes_app_state(self) -> None:
+        source = _read_api()
+        assert "app.state.ctx = AppState(" in source
+
+    def test_plan_requires_ready_state_dependency(self) -> None:
+        source = _read_api()
+        assert "Depends(get_app_state)" in source
+
     def test_lifespan_bound_to_app(self) -> None:
         source = _read_api()
         assert "lifespan=lifespan" in source
 
 
+# ──────────────────────────────────────────────────────────────
+# Health Endpoint
+# ──────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def health_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple[Any, Any]]:
+    """TestClient for api.app without running the lifespan (no GPU bootstrap)."""
+    from fastapi.testclient import TestClient
+    from starlette.datastructures import State
+
+    import api
+
+    # A fresh State per test, as if the lifespan had never run
+    monkeypatch.setattr(api.app, "state", State())
+    yield TestClient(api.app), api
+
+
+class TestApiHealth:
+    """Verify /api/health answers 503 until the FoundryLocal client is ready."""
+
+    def test_starting_while_bootstrapping(self, health_client: tuple[Any, Any]) -> None:
+        client, api = health_client
+        api.app.state.bootstrap = Future()
+        response = client.get("/api/health")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    def test_unhealthy_after_failed_bootstrap(self, health_client: tuple[Any, Any]) -> None:
+        client, api = health_client
+        failed: Future[None] = Future()
+        failed.set_exception(RuntimeError("GPU not found"))
+        api.app.state.bootstrap = failed
+        response = client.get("/api/health")
+        assert response.status_code == 503
+        assert response.json()["status"] == "unhealthy"
+
+    def test_healthy_once_client_ready(self, health_client: tuple[Any, Any]) -> None:
+        client, api = health_client
+        settings = api.Settings()
+        api.app.state.ctx = api.AppState(client=object(), settings=settings)
+        response = client.get("/api/health")
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "healthy",
+            "service": "travel-planner-api",
+            "model": settings.foundry_model_id,
+        }
+
+    def test_no_lifespan_state_reports_starting(self, health_client: tuple[Any, Any]) -> None:
+        """The endpoint must not raise when app.state was never populated."""
+        client, _ = health_client
+        response = client.get("/api/health")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+
 # ──────────────────────────────────────────────────────────────
 # Workflow Integration
 # ──────────────────────────────────────────────────────────────
@@ -247,10 +373,10 @@ class TestApiWorkflowIntegration:
         assert "async with mcp_tool" in source
 
     def test_tracks_sent_messages_for_incremental_streaming(self) -> None:
-        """API must track sent_message_count to avoid duplicate messages with intermediate_outputs."""
+        """API must track sent_idx to avoid duplicate messages with intermediate_outputs."""
         source = _read_api()
-        assert "sent_message_count" in source, (
-            "api.py must track sent_message_count for incremental streaming"
+        assert "sent_idx" in source, (
+            "api.py must track sent_idx for incremental streaming"
         )
 
 
@@ -264,7 +390,7 @@ class TestApiDependencies:
     @pytest.mark.parametrize("package", [
         "fastapi",
         "uvicorn",
-        "sse-starlette",
+        "orjson",
         "opentelemetry-instrumentation-fastapi",
     ])
     def test_dependency_in_requirements(self, package: str) -> None:
@@ -289,6 +415,17 @@ class TestApiEntryPoint:
         source = _read_api()
         assert "uvicorn.run(" in source
 
+    def test_main_uses_uvloop_and_httptools(self) -> None:
+        source = _read_api()
+        assert 'loop = "uvloop"' in source
+        assert 'http="httptools"' in source
+
+    def test_main_falls_back_without_uvloop(self) -> None:
+        """uvloop is unavailable on Windows; the server must still start."""
+        source = _read_api()
+        assert "except ImportError" in source
+        assert 'loop = "auto"' in source
+
 
 # ──────────────────────────────────────────────────────────────
 # Config Integration
@@ -82,3 +82,60 @@ class TestApiSettings:
     def test_api_port_is_int(self) -> None:
         s = Settings()
         assert isinstance(s.api_port, int)
+
+
+class TestSseSettings:
+    """Tests for the SSE streaming settings fields."""
+
+    def test_sse_max_queue_size_default(self) -> None:
+        s = Settings()
+        assert s.sse_max_queue_size == 256
+
+    def test_sse_queue_timeout_default(self) -> None:
+        s = Settings()
+        assert s.sse_queue_timeout == 30.0
+
+    def test_sse_flush_interval_ms_default(self) -> None:
+        s = Settings()
+        assert s.sse_flush_interval_ms == 10
+
+    def test_reads_sse_flush_interval_ms_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SSE_FLUSH_INTERVAL_MS", "0")
+        s = get_settings()
+        assert s.sse_flush_interval_ms == 0
+
+    def test_sse_compress_default(self) -> None:
+        s = Settings()
+        assert s.sse_compress is False
+
+    def test_reads_sse_compress_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SSE_COMPRESS", "1")
+        s = get_settings()
+        assert s.sse_compress is True
+
+    def test_reads_sse_max_queue_size_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SSE_MAX_QUEUE_SIZE", "16")
+        s = get_settings()
+        assert s.sse_max_queue_size == 16
+
+    def test_reads_sse_queue_timeout_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SSE_QUEUE_TIMEOUT", "2.5")
+        s = get_settings()
+        assert s.sse_queue_timeout == 2.5
+
+
+class TestUvicornSettings:
+    """Tests for the uvicorn server tuning fields."""
+
+    def test_uvicorn_workers_default(self) -> None:
+        s = Settings()
+        assert s.uvicorn_workers == 1
+
+    def test_uvicorn_limit_concurrency_default(self) -> None:
+        s = Settings()
+        assert s.uvicorn_limit_concurrency == 1024
+
+    def test_reads_uvicorn_workers_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("UVICORN_WORKERS", "4")
+        s = get_settings()
+        assert s.uvicorn_workers == 4
@@ -4,315 +4,282 @@ Docker Integration Tests
 Structural tests for docker-compose.yml and related container configuration.
 Validates service definitions, ports, dependencies, volumes,
 and OTel Collector configuration.
+
+Tests share session-scoped, read-only fixtures and touch no other state, so the
+module can be distributed with pytest-xdist (`pytest -n auto`); each worker
+then parses the config files once. They leave nothing worth caching either, so
+one-off CI runs can add `-p no:cacheprovider` to skip writing .pytest_cache.
+
+Parsed YAML is shared between tests, so fixtures hand out a deeply frozen
+copy (mappings as MappingProxyType, lists as tuples, sets as frozensets)
+instead of per-test deep copies.
 """
 
-import os
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 import pytest
 import yaml
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+from tests._literals import find_literals
 
+# libyaml-backed loader when available; same semantics as yaml.safe_load
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
 
-# ──────────────────────────────────────────────────────────────
-# Helpers
-# ──────────────────────────────────────────────────────────────
+BASE_DIR = Path(__file__).resolve().parent.parent
+COMPOSE_PATH = BASE_DIR / "docker-compose.yml"
+OTEL_CONFIG_DIR = BASE_DIR / "otel-collector"
+OTEL_CONFIG_PATH = OTEL_CONFIG_DIR / "otel-collector-config.yaml"
+WEB_UI_DOCKERFILE = BASE_DIR / "web_ui" / "Dockerfile"
+MCP_DOCKERFILE = BASE_DIR / "mcp_server" / "Dockerfile"
 
-def _read_compose() -> str:
-    """Read docker-compose.yml as raw text."""
-    path = os.path.join(BASE_DIR, "docker-compose.yml")
-    with open(path, encoding="utf-8") as f:
-        return f.read()
+# Ports and endpoints shared by compose, the collector config and nginx.conf
+PORT_MCP = "8090"
+PORT_WEB = "8080"
+PORT_ASPIRE_UI = "18888"
+PORT_OTLP_GRPC = "4317"
+PORT_COLLECTOR_HTTP = "4319"
+API_HOST_PROXY = "host.docker.internal:8000"  # where `python api.py` runs
+COLLECTOR_PROXY = f"otel-collector:{PORT_COLLECTOR_HTTP}"
+ASPIRE_GRPC_EXPORT = "aspire-dashboard:18889"
 
+# Literal needles for the raw-text checks, one regex scan per file
+NGINX_NEEDLES = (API_HOST_PROXY, COLLECTOR_PROXY)  # /api/ and /otlp/ upstreams
+OTEL_TEXT_NEEDLES = (PORT_COLLECTOR_HTTP, ASPIRE_GRPC_EXPORT)
 
-def _parse_compose() -> dict:
-    """Parse docker-compose.yml into a Python dict."""
-    path = os.path.join(BASE_DIR, "docker-compose.yml")
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+# Services docker-compose.yml must define (and nothing else)
+SERVICES = ("mcp-server", "aspire-dashboard", "web-ui", "otel-collector")
 
 
-def _read_otel_collector_config() -> str:
-    """Read OTel Collector config as raw text."""
-    path = os.path.join(BASE_DIR, "otel-collector", "otel-collector-config.yaml")
-    with open(path, encoding="utf-8") as f:
-        return f.read()
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=None)
+def _load_cached(path: Path, mtime_ns: int) -> tuple[bytes, dict]:
+    raw = path.read_bytes()
+    # Bytes go straight to libyaml, which decodes them in C
+    return raw, yaml.load(raw, Loader=_Loader)
 
-def _parse_otel_collector_config() -> dict:
-    """Parse OTel Collector config into a Python dict."""
-    path = os.path.join(BASE_DIR, "otel-collector", "otel-collector-config.yaml")
-    with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
 
+def _load(path: Path) -> tuple[bytes, dict]:
+    """Read a YAML file once and return its raw bytes and parsed value.
 
-# ──────────────────────────────────────────────────────────────
-# File Existence
-# ──────────────────────────────────────────────────────────────
+    Memoized per (path, mtime) so the raw-text checks and every parse in the
+    process share one read, while a file changed mid-session is picked up on
+    the next call.
+    """
+    return _load_cached(path, path.stat().st_mtime_ns)
 
-class TestDockerFilesExist:
-    """Verify Docker-related files exist."""
 
-    def test_compose_file_exists(self) -> None:
-        assert os.path.isfile(os.path.join(BASE_DIR, "docker-compose.yml"))
+def _parse_compose() -> dict:
+    """Parse docker-compose.yml into a Python dict."""
+    return _load(COMPOSE_PATH)[1]
 
-    def test_otel_collector_dir_exists(self) -> None:
-        assert os.path.isdir(os.path.join(BASE_DIR, "otel-collector"))
 
-    def test_otel_collector_config_exists(self) -> None:
-        assert os.path.isfile(
-            os.path.join(BASE_DIR, "otel-collector", "otel-collector-config.yaml")
-        )
+def _parse_otel_collector_config() -> dict:
+    """Parse OTel Collector config into a Python dict."""
+    return _load(OTEL_CONFIG_PATH)[1]
 
-    def test_web_ui_dockerfile_exists(self) -> None:
-        assert os.path.isfile(os.path.join(BASE_DIR, "web_ui", "Dockerfile"))
 
-    def test_mcp_server_dockerfile_exists(self) -> None:
-        assert os.path.isfile(os.path.join(BASE_DIR, "mcp_server", "Dockerfile"))
+def _freeze(value: Any) -> Any:
+    """Read-only deep copy of parsed YAML: mappings, lists and sets become immutable."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
 
 
-# ──────────────────────────────────────────────────────────────
-# Service Definitions
-# ──────────────────────────────────────────────────────────────
+def _env_names(env: Sequence | Mapping) -> frozenset[str]:
+    """Variable names from a compose `environment` block in list or mapping form."""
+    if isinstance(env, Mapping):
+        return frozenset(env)
+    return frozenset(str(item).split("=", 1)[0] for item in env)
 
-class TestComposeServices:
-    """Verify docker-compose.yml defines all required services."""
-
-    @pytest.mark.parametrize("service_name", [
-        "mcp-server",
-        "aspire-dashboard",
-        "web-ui",
-        "otel-collector",
-    ])
-    def test_service_defined(self, service_name: str) -> None:
-        compose = _parse_compose()
-        services = compose.get("services", {})
-        assert service_name in services, (
-            f"Service '{service_name}' must be defined in docker-compose.yml"
-        )
 
-    def test_total_service_count(self) -> None:
-        compose = _parse_compose()
-        services = compose.get("services", {})
-        assert len(services) == 4, "docker-compose.yml must define exactly 4 services"
+def _dig(config: Mapping[str, Any], path: str) -> Any:
+    """Walk a dotted key path into parsed YAML, yielding {} for missing keys."""
+    value: Any = config
+    for key in path.split("."):
+        value = value.get(key, {})
+    return value
 
 
 # ──────────────────────────────────────────────────────────────
-# MCP Server Service
+# Fixtures
 # ──────────────────────────────────────────────────────────────
 
-class TestMCPServerService:
-    """Verify mcp-server service configuration."""
-
-    def test_builds_from_mcp_server_dir(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["mcp-server"]
-        build = svc.get("build", {})
-        assert "mcp_server" in str(build.get("context", ""))
+@pytest.fixture(scope="session")
+def compose() -> Mapping[str, Any]:
+    """docker-compose.yml parsed once per test session (deeply frozen)."""
+    return _freeze(_parse_compose())
 
-    def test_publishes_port_8090(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["mcp-server"]
-        ports = [str(p) for p in svc.get("ports", [])]
-        assert any("8090" in p for p in ports)
 
-    def test_has_otel_environment(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["mcp-server"]
-        env = svc.get("environment", [])
-        env_str = str(env)
-        assert "OTEL_SERVICE_NAME" in env_str
+@pytest.fixture(scope="session")
+def nginx_found(nginx_conf: bytes) -> frozenset[str]:
+    """NGINX_NEEDLES present in web_ui/nginx.conf (conftest's nginx_conf), scanned once."""
+    return find_literals(nginx_conf.decode("utf-8"), NGINX_NEEDLES)
 
-    def test_depends_on_aspire(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["mcp-server"]
-        depends = svc.get("depends_on", [])
-        assert "aspire-dashboard" in depends
 
-    def test_has_healthcheck(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["mcp-server"]
-        assert "healthcheck" in svc
+@pytest.fixture(scope="session")
+def service_index(compose: Mapping[str, Any]) -> Mapping[str, Mapping[str, Any]]:
+    """Per-service lookup table built once from the parsed compose file.
 
+    List settings are joined into one newline-separated string so each check
+    is a single substring test; `environment` and `depends_on` are frozensets
+    for exact name matches. Both levels of the index are read-only.
+    """
+    index = {}
+    for name, svc in compose["services"].items():
+        index[name] = MappingProxyType({
+            "build": str(svc.get("build", {}).get("context", "")),
+            "image": svc.get("image", ""),
+            "ports": "\n".join(map(str, svc.get("ports", []))),
+            "environment": _env_names(svc.get("environment", [])),
+            "depends_on": frozenset(svc.get("depends_on", []) or []),
+            "volumes": "\n".join(map(str, svc.get("volumes", []))),
+            "extra_hosts": "\n".join(map(str, svc.get("extra_hosts", []))),
+            "healthcheck": "healthcheck" in svc,
+        })
+    return MappingProxyType(index)
 
-# ──────────────────────────────────────────────────────────────
-# Aspire Dashboard Service
-# ──────────────────────────────────────────────────────────────
-
-class TestAspireDashboardService:
-    """Verify aspire-dashboard service configuration."""
 
-    def test_uses_aspire_image(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["aspire-dashboard"]
-        image = svc.get("image", "")
-        assert "aspire-dashboard" in image
+@pytest.fixture(scope="session")
+def otel_config() -> Mapping[str, Any]:
+    """OTel Collector config parsed once per test session (deeply frozen)."""
+    return _freeze(_parse_otel_collector_config())
 
-    def test_publishes_ui_port(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["aspire-dashboard"]
-        ports = [str(p) for p in svc.get("ports", [])]
-        assert any("18888" in p for p in ports)
 
-    def test_publishes_otlp_grpc_port(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["aspire-dashboard"]
-        ports = [str(p) for p in svc.get("ports", [])]
-        assert any("4317" in p for p in ports)
+@pytest.fixture(scope="session")
+def otel_found() -> frozenset[str]:
+    """OTEL_TEXT_NEEDLES present in the OTel Collector config, scanned once per session.
 
-    def test_anonymous_auth_enabled(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["aspire-dashboard"]
-        env = svc.get("environment", [])
-        env_str = str(env)
-        assert "UNSECURED_ALLOW_ANONYMOUS" in env_str
+    Scans the bytes cached by _load, so the file is read once for both the text
+    checks and the YAML parse.
+    """
+    raw, _ = _load(OTEL_CONFIG_PATH)
+    return find_literals(raw.decode("utf-8"), OTEL_TEXT_NEEDLES)
 
 
 # ──────────────────────────────────────────────────────────────
-# Web UI Service
+# File Existence
 # ──────────────────────────────────────────────────────────────
 
-class TestWebUIService:
-    """Verify web-ui service configuration."""
-
-    def test_builds_from_web_ui_dir(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["web-ui"]
-        build = svc.get("build", {})
-        assert "web_ui" in str(build.get("context", ""))
-
-    def test_publishes_port_8080(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["web-ui"]
-        ports = [str(p) for p in svc.get("ports", [])]
-        assert any("8080" in p for p in ports)
-
-    def test_has_extra_hosts(self) -> None:
-        """web-ui needs host.docker.internal to reach FastAPI on the host."""
-        compose = _parse_compose()
-        svc = compose["services"]["web-ui"]
-        extra_hosts = svc.get("extra_hosts", [])
-        assert any("host.docker.internal" in str(h) for h in extra_hosts)
-
-    def test_depends_on_mcp_server(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["web-ui"]
-        depends = svc.get("depends_on", [])
-        assert "mcp-server" in depends
-
-    def test_depends_on_otel_collector(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["web-ui"]
-        depends = svc.get("depends_on", [])
-        assert "otel-collector" in depends
-
-    def test_has_healthcheck(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["web-ui"]
-        assert "healthcheck" in svc
+class TestDockerFilesExist:
+    """Verify Docker-related files exist."""
+
+    @pytest.mark.parametrize("path,is_dir", [
+        (COMPOSE_PATH, False),
+        (OTEL_CONFIG_DIR, True),
+        (OTEL_CONFIG_PATH, False),
+        (WEB_UI_DOCKERFILE, False),
+        (MCP_DOCKERFILE, False),
+    ], ids=lambda p: str(p.relative_to(BASE_DIR)) if isinstance(p, Path) else None)
+    def test_path_exists(self, path: Path, is_dir: bool) -> None:
+        assert path.is_dir() if is_dir else path.is_file()
 
 
 # ──────────────────────────────────────────────────────────────
-# OTel Collector Service
+# Service Definitions
 # ──────────────────────────────────────────────────────────────
 
-class TestOtelCollectorService:
-    """Verify otel-collector service configuration."""
-
-    def test_uses_contrib_image(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["otel-collector"]
-        image = svc.get("image", "")
-        assert "opentelemetry-collector-contrib" in image
+# (service, setting, needle) for every per-service compose assertion. The
+# setting is a service_index field that must contain the needle, or be truthy
+# when the needle is None; "defined" checks the service itself exists.
+COMPOSE_CHECKS = [
+    *((name, "defined", None) for name in SERVICES),
+    # mcp-server
+    ("mcp-server", "build", "mcp_server"),
+    ("mcp-server", "ports", PORT_MCP),
+    ("mcp-server", "environment", "OTEL_SERVICE_NAME"),
+    ("mcp-server", "depends_on", "aspire-dashboard"),
+    ("mcp-server", "healthcheck", None),
+    # aspire-dashboard
+    ("aspire-dashboard", "image", "aspire-dashboard"),
+    ("aspire-dashboard", "ports", PORT_ASPIRE_UI),
+    ("aspire-dashboard", "ports", PORT_OTLP_GRPC),
+    ("aspire-dashboard", "environment", "DOTNET_DASHBOARD_UNSECURED_ALLOW_ANONYMOUS"),
+    # web-ui (needs host.docker.internal to reach FastAPI on the host)
+    ("web-ui", "build", "web_ui"),
+    ("web-ui", "ports", PORT_WEB),
+    ("web-ui", "extra_hosts", "host.docker.internal"),
+    ("web-ui", "depends_on", "mcp-server"),
+    ("web-ui", "depends_on", "otel-collector"),
+    ("web-ui", "healthcheck", None),
+    # otel-collector
+    ("otel-collector", "image", "opentelemetry-collector-contrib"),
+    ("otel-collector", "ports", PORT_COLLECTOR_HTTP),
+    ("otel-collector", "volumes", "otel-collector-config.yaml"),
+    ("otel-collector", "depends_on", "aspire-dashboard"),
+]
 
-    def test_publishes_port_4319(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["otel-collector"]
-        ports = [str(p) for p in svc.get("ports", [])]
-        assert any("4319" in p for p in ports)
 
-    def test_mounts_config_volume(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["otel-collector"]
-        volumes = [str(v) for v in svc.get("volumes", [])]
-        assert any("otel-collector-config.yaml" in v for v in volumes)
-
-    def test_depends_on_aspire(self) -> None:
-        compose = _parse_compose()
-        svc = compose["services"]["otel-collector"]
-        depends = svc.get("depends_on", [])
-        assert "aspire-dashboard" in depends
+class TestComposeServices:
+    """Verify docker-compose.yml defines all required services and their settings."""
+
+    @pytest.mark.parametrize(
+        "service,setting,needle",
+        COMPOSE_CHECKS,
+        ids=["-".join(filter(None, check)) for check in COMPOSE_CHECKS],
+    )
+    def test_compose(
+        self, service_index: Mapping[str, Mapping[str, Any]], service: str, setting: str, needle: str | None
+    ) -> None:
+        if setting == "defined":
+            assert service in service_index, (
+                f"Service '{service}' must be defined in docker-compose.yml"
+            )
+            return
+        value = service_index[service][setting]
+        assert value if needle is None else needle in value
+
+    def test_total_service_count(self, compose: Mapping[str, Any]) -> None:
+        services = compose.get("services", {})
+        assert len(services) == len(SERVICES), (
+            f"docker-compose.yml must define exactly {len(SERVICES)} services"
+        )
 
 
 # ──────────────────────────────────────────────────────────────
 # OTel Collector Configuration
 # ──────────────────────────────────────────────────────────────
 
+# (dotted key path, needle): the value at the path must contain the needle,
+# or be non-empty when the needle is None.
+OTEL_CONFIG_CHECKS = [
+    ("receivers", "otlp"),
+    ("receivers.otlp.protocols", "http"),
+    # Browser OTLP calls need CORS headers
+    ("receivers.otlp.protocols.http.cors.allowed_origins", None),
+    ("exporters", "otlp/aspire"),
+    ("exporters.otlp/aspire.endpoint", "aspire-dashboard"),
+    ("processors", "batch"),
+    ("service.pipelines", "traces"),
+    ("service.pipelines.traces.receivers", "otlp"),
+    ("service.pipelines.traces.exporters", "otlp/aspire"),
+    ("service.pipelines.traces.processors", "batch"),
+]
+
+
 class TestOtelCollectorConfig:
     """Verify OTel Collector pipeline configuration."""
 
-    def test_has_otlp_receiver(self) -> None:
-        config = _parse_otel_collector_config()
-        receivers = config.get("receivers", {})
-        assert "otlp" in receivers
-
-    def test_otlp_receiver_uses_http(self) -> None:
-        config = _parse_otel_collector_config()
-        otlp = config["receivers"]["otlp"]
-        protocols = otlp.get("protocols", {})
-        assert "http" in protocols
-
-    def test_otlp_receiver_listens_on_4319(self) -> None:
-        config_text = _read_otel_collector_config()
-        assert "4319" in config_text
-
-    def test_otlp_receiver_has_cors(self) -> None:
-        """Browser OTLP calls need CORS headers."""
-        config = _parse_otel_collector_config()
-        http_config = config["receivers"]["otlp"]["protocols"]["http"]
-        cors = http_config.get("cors", {})
-        assert cors, "CORS must be configured for HTTP receiver"
-        allowed = cors.get("allowed_origins", [])
-        assert len(allowed) > 0, "At least one CORS origin must be allowed"
-
-    def test_has_aspire_exporter(self) -> None:
-        config = _parse_otel_collector_config()
-        exporters = config.get("exporters", {})
-        assert "otlp/aspire" in exporters
-
-    def test_aspire_exporter_targets_aspire_dashboard(self) -> None:
-        config = _parse_otel_collector_config()
-        aspire_exporter = config["exporters"]["otlp/aspire"]
-        endpoint = aspire_exporter.get("endpoint", "")
-        assert "aspire-dashboard" in endpoint
-
-    def test_has_batch_processor(self) -> None:
-        config = _parse_otel_collector_config()
-        processors = config.get("processors", {})
-        assert "batch" in processors
-
-    def test_traces_pipeline_defined(self) -> None:
-        config = _parse_otel_collector_config()
-        pipelines = config.get("service", {}).get("pipelines", {})
-        assert "traces" in pipelines
-
-    def test_traces_pipeline_uses_otlp_receiver(self) -> None:
-        config = _parse_otel_collector_config()
-        traces = config["service"]["pipelines"]["traces"]
-        receivers = traces.get("receivers", [])
-        assert "otlp" in receivers
-
-    def test_traces_pipeline_uses_aspire_exporter(self) -> None:
-        config = _parse_otel_collector_config()
-        traces = config["service"]["pipelines"]["traces"]
-        exporters = traces.get("exporters", [])
-        assert "otlp/aspire" in exporters
-
-    def test_traces_pipeline_uses_batch_processor(self) -> None:
-        config = _parse_otel_collector_config()
-        traces = config["service"]["pipelines"]["traces"]
-        processors = traces.get("processors", [])
-        assert "batch" in processors
+    @pytest.mark.parametrize("path,needle", OTEL_CONFIG_CHECKS, ids=[c[0] for c in OTEL_CONFIG_CHECKS])
+    def test_config(self, otel_config: Mapping[str, Any], path: str, needle: str | None) -> None:
+        value = _dig(otel_config, path)
+        assert value if needle is None else needle in value
+
+    def test_otlp_receiver_listens_on_4319(self, otel_found: frozenset[str]) -> None:
+        assert PORT_COLLECTOR_HTTP in otel_found
 
 
 # ──────────────────────────────────────────────────────────────
@@ -322,21 +289,10 @@ class TestOtelCollectorConfig:
 class TestPortConsistency:
     """Cross-check that ports in docker-compose match what consumers expect."""
 
-    def test_nginx_api_proxy_matches_compose_implied_host_port(self) -> None:
-        """Nginx proxies to host:8000, which is where `python api.py` runs."""
-        nginx = os.path.join(BASE_DIR, "web_ui", "nginx.conf")
-        with open(nginx, encoding="utf-8") as f:
-            nginx_text = f.read()
-        assert "host.docker.internal:8000" in nginx_text
-
-    def test_nginx_otlp_proxy_matches_collector_port(self) -> None:
-        """Nginx proxies /otlp/ to otel-collector:4319."""
-        nginx = os.path.join(BASE_DIR, "web_ui", "nginx.conf")
-        with open(nginx, encoding="utf-8") as f:
-            nginx_text = f.read()
-        assert "otel-collector:4319" in nginx_text
-
-    def test_collector_exports_to_aspire_grpc_port(self) -> None:
+    @pytest.mark.parametrize("needle", NGINX_NEEDLES)
+    def test_nginx_proxy_targets(self, nginx_found: frozenset[str], needle: str) -> None:
+        assert needle in nginx_found
+
+    def test_collector_exports_to_aspire_grpc_port(self, otel_found: frozenset[str]) -> None:
         """Collector sends gRPC to aspire-dashboard:18889."""
-        config_text = _read_otel_collector_config()
-        assert "aspire-dashboard:18889" in config_text
+        assert ASPIRE_GRPC_EXPORT in otel_found
@@ -0,0 +1,205 @@
+"""
+Workflow Event Handler Tests
+============================
+Behavioral tests for the SSE event handlers (src/events.py), driven with fake
+workflow events and messages — no Agent Framework, GPU or FastAPI app needed.
+"""
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import orjson
+import pytest
+
+import src.events as events
+from src.events import EVENT_HANDLERS, StreamState
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+class _Span:
+    """Stand-in for an OTel span that records whether it was ended."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.ended = False
+
+    def end(self) -> None:
+        self.ended = True
+
+
+def _msg(role: str, text: str, author: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(role=role, text=text, author_name=author)
+
+
+def _dispatch(stream: StreamState, event_type: str, **fields: Any) -> list[bytes]:
+    event = SimpleNamespace(type=event_type, **fields)
+    return list(EVENT_HANDLERS[event_type](event, stream))
+
+
+def _parse(frame: bytes) -> tuple[str, Any]:
+    """Split an `event: <type>\\ndata: <json>\\n\\n` frame into type and payload."""
+    assert frame.endswith(b"\n\n")
+    event_line, data_line = frame[:-2].split(b"\n")
+    assert event_line.startswith(b"event: ") and data_line.startswith(b"data: ")
+    return event_line[7:].decode(), orjson.loads(data_line[6:])
+
+
+@pytest.fixture
+def spans(monkeypatch: pytest.MonkeyPatch) -> list[_Span]:
+    """Record the agent spans the handlers start instead of creating real ones."""
+    started: list[_Span] = []
+
+    def start(name: str) -> _Span:
+        started.append(_Span(name))
+        return started[-1]
+
+    monkeypatch.setattr(events, "start_agent_span", start)
+    return started
+
+
+# ──────────────────────────────────────────────────────────────
+# Output Messages
+# ──────────────────────────────────────────────────────────────
+
+class TestOutputHandler:
+    """Verify output events stream each new assistant message exactly once."""
+
+    def test_streams_only_assistant_messages(self) -> None:
+        conversation = [_msg("user", "Plan Rome"), _msg("assistant", "Rome facts", "Researcher")]
+        frames = _dispatch(StreamState(), "output", data=conversation)
+        assert [_parse(f) for f in frames] == [
+            ("message", {"role": "assistant", "author": "Researcher", "text": "Rome facts"}),
+        ]
+
+    def test_author_defaults_to_assistant(self) -> None:
+        frames = _dispatch(StreamState(), "output", data=[_msg("Assistant", "hi")])
+        assert _parse(frames[0])[1]["author"] == "Assistant"
+
+    def test_cumulative_outputs_send_only_new_messages(self) -> None:
+        """intermediate_outputs=True re-sends the whole conversation after each agent."""
+        user = _msg("user", "Plan Rome")
+        first = _msg("assistant", "facts", "Researcher")
+        second = _msg("assistant", "forecast", "WeatherAnalyst")
+        third = _msg("assistant", "itinerary", "Planner")
+        state = StreamState()
+
+        sent = _dispatch(state, "output", data=SimpleNamespace(full_conversation=[user, first]))
+        sent += _dispatch(state, "output", data=SimpleNamespace(full_conversation=[user, first, second]))
+        # The final event carries a plain list of the complete conversation
+        sent += _dispatch(state, "output", data=[user, first, second, third])
+
+        assert [_parse(f)[1]["text"] for f in sent] == ["facts", "forecast", "itinerary"]
+        assert state.sent_idx == 4
+
+    def test_messages_before_offset_are_skipped(self) -> None:
+        state = StreamState()
+        state.sent_idx = 2
+        conversation = [_msg("assistant", "old"), _msg("assistant", "older"), _msg("assistant", "new")]
+        frames = _dispatch(state, "output", data=conversation)
+        assert [_parse(f)[1]["text"] for f in frames] == ["new"]
+
+    def test_encoded_frame_is_cached_per_message(self) -> None:
+        message = _msg("assistant", "facts")
+        state = StreamState()
+        (frame,) = _dispatch(state, "output", data=[message])
+        state.sent_idx = 0
+        (again,) = _dispatch(state, "output", data=[message])
+        assert again is frame
+        assert state.msg_cache[id(message)] == (message, frame)
+
+    def test_missing_full_conversation_sends_nothing(self) -> None:
+        state = StreamState()
+        assert _dispatch(state, "output", data=SimpleNamespace(full_conversation=None)) == []
+        assert state.sent_idx == 0
+
+    @pytest.mark.parametrize("data", [None, []])
+    def test_empty_output_is_ignored(self, data: Any) -> None:
+        state = StreamState()
+        assert _dispatch(state, "output", data=data) == []
+        assert state.sent_idx == 0
+
+    def test_unexpected_output_type_is_logged_and_skipped(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        state = StreamState()
+        with caplog.at_level(logging.WARNING, logger=events.__name__):
+            assert _dispatch(state, "output", data="plain text") == []
+        assert "Unexpected output type: str" in caplog.text
+        assert state.sent_idx == 0
+
+
+# ──────────────────────────────────────────────────────────────
+# Executor Lifecycle
+# ──────────────────────────────────────────────────────────────
+
+class TestExecutorHandlers:
+    """Verify agent_started/agent_completed frames and the agent.<name> spans."""
+
+    def test_invoked_emits_agent_started_and_opens_span(self, spans: list[_Span]) -> None:
+        state = StreamState()
+        frames = _dispatch(state, "executor_invoked", executor_id="Researcher")
+        assert [_parse(f) for f in frames] == [("agent_started", {"agent": "Researcher"})]
+        assert [s.name for s in spans] == ["Researcher"]
+        assert state.agent_spans == {"Researcher": spans[0]}
+        assert not spans[0].ended
+
+    def test_completed_emits_agent_completed_and_ends_span(self, spans: list[_Span]) -> None:
+        state = StreamState()
+        _dispatch(state, "executor_invoked", executor_id="Planner")
+        frames = _dispatch(state, "executor_completed", executor_id="Planner")
+        assert [_parse(f) for f in frames] == [("agent_completed", {"agent": "Planner"})]
+        assert spans[0].ended
+        assert state.agent_spans == {}
+
+    def test_reinvoked_executor_ends_previous_span(self, spans: list[_Span]) -> None:
+        state = StreamState()
+        _dispatch(state, "executor_invoked", executor_id="Planner")
+        _dispatch(state, "executor_invoked", executor_id="Planner")
+        assert [s.ended for s in spans] == [True, False]
+        assert state.agent_spans == {"Planner": spans[1]}
+
+    def test_completed_without_invoked_is_harmless(self, spans: list[_Span]) -> None:
+        frames = _dispatch(StreamState(), "executor_completed", executor_id="Planner")
+        assert [_parse(f)[0] for f in frames] == ["agent_completed"]
+        assert spans == []
+
+    def test_end_agent_spans_closes_unfinished_agents(self, spans: list[_Span]) -> None:
+        state = StreamState()
+        _dispatch(state, "executor_invoked", executor_id="Researcher")
+        _dispatch(state, "executor_invoked", executor_id="WeatherAnalyst")
+        state.end_agent_spans()
+        assert all(s.ended for s in spans)
+        assert state.agent_spans == {}
+
+    def test_per_event_logs_stay_below_info(
+        self, spans: list[_Span], caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """INFO is reserved for startup/shutdown; per-event logs are DEBUG only."""
+        state = StreamState()
+        with caplog.at_level(logging.INFO, logger=events.__name__):
+            _dispatch(state, "executor_invoked", executor_id="Researcher")
+            _dispatch(state, "executor_completed", executor_id="Researcher")
+        assert caplog.records == []
+
+
+# ──────────────────────────────────────────────────────────────
+# Dispatch
+# ──────────────────────────────────────────────────────────────
+
+class TestEventDispatch:
+    """Verify the event type → handler table."""
+
+    def test_status_event_is_forwarded(self) -> None:
+        frames = _dispatch(StreamState(), "status", state="IN_PROGRESS")
+        assert [_parse(f) for f in frames] == [("status", {"state": "IN_PROGRESS"})]
+
+    def test_handled_event_types(self) -> None:
+        assert set(EVENT_HANDLERS) == {"status", "executor_invoked", "executor_completed", "output"}
+
+    def test_precomputed_frames_are_well_formed(self) -> None:
+        assert _parse(events.FRAME_WORKFLOW_BUILT)[0] == "status"
+        assert _parse(events.FRAME_DONE) == ("done", {"message": "Stream complete"})
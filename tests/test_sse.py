@@ -0,0 +1,164 @@
+"""
+SSE Transport Tests
+===================
+Behavioral tests for the SSE relay and gzip encoder (src/sse.py), driven with
+in-memory async byte sources — no FastAPI app, GPU or Agent Framework needed.
+"""
+
+import zlib
+from typing import AsyncGenerator
+
+import anyio
+import pytest
+
+from src.sse import FLUSH_MAX_BYTES, PING_FRAME, accepts_gzip, gzip_frames, relay_frames
+
+# relay_frames drives its producer with asyncio.create_task
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _Source:
+    """Async byte source that records whether it was closed."""
+
+    def __init__(self, frames: list[bytes], *, delay: float = 0.0, endless: bool = False) -> None:
+        self.frames = frames
+        self.delay = delay
+        self.endless = endless
+        self.closed = False
+
+    async def __call__(self) -> AsyncGenerator[bytes, None]:
+        try:
+            while True:
+                for frame in self.frames:
+                    if self.delay:
+                        await anyio.sleep(self.delay)
+                    yield frame
+                if not self.endless:
+                    return
+        finally:
+            self.closed = True
+
+
+def _relay(source: _Source, **overrides: float) -> AsyncGenerator[bytes, None]:
+    options = {"max_queue_size": 16, "queue_timeout": 5.0, "flush_interval_ms": 50}
+    return relay_frames(source(), **{**options, **overrides})
+
+
+async def _collect(chunks: AsyncGenerator[bytes, None]) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+# ──────────────────────────────────────────────────────────────
+# Relay
+# ──────────────────────────────────────────────────────────────
+
+class TestRelayFrames:
+    """Verify coalescing, heartbeats and backpressure in relay_frames."""
+
+    async def test_coalesces_back_to_back_frames(self) -> None:
+        frames = [b"event: a\ndata: 1\n\n", b"event: b\ndata: 2\n\n", b"event: c\ndata: 3\n\n"]
+        chunks = await _collect(_relay(_Source(frames)))
+        assert chunks == [b"".join(frames)]
+
+    async def test_caps_coalesced_chunk_size(self) -> None:
+        frame = b"x" * (FLUSH_MAX_BYTES // 2)
+        chunks = await _collect(_relay(_Source([frame] * 6)))
+        assert b"".join(chunks) == frame * 6
+        assert len(chunks) > 1
+        # A batch stops growing once it reaches FLUSH_MAX_BYTES
+        assert all(len(chunk) <= FLUSH_MAX_BYTES for chunk in chunks)
+
+    async def test_sends_ping_while_source_is_idle(self) -> None:
+        source = _Source([b"data: late\n\n"], delay=0.2)
+        chunks = await _collect(_relay(source, heartbeat_interval=0.05, flush_interval_ms=0))
+        assert chunks[0] == PING_FRAME
+        assert chunks[-1] == b"data: late\n\n"
+        assert set(chunks[:-1]) == {PING_FRAME}
+
+    async def test_disconnects_slow_client_and_closes_source(self) -> None:
+        source = _Source([b"data: x\n\n"], endless=True)
+        relay = _relay(source, max_queue_size=1, queue_timeout=0.05, flush_interval_ms=0)
+        await relay.__anext__()
+        # Stop reading until the producer gives up on the full buffer
+        await anyio.sleep(0.3)
+        with anyio.fail_after(5):
+            remaining = await _collect(relay)
+        assert len(remaining) <= 2, "relay must end instead of buffering without bound"
+        assert source.closed
+
+    async def test_closing_relay_closes_source(self) -> None:
+        source = _Source([b"data: x\n\n"], delay=0.01, endless=True)
+        relay = _relay(source, flush_interval_ms=0)
+        await relay.__anext__()
+        await relay.aclose()
+        assert source.closed
+
+    async def test_source_exhaustion_ends_stream(self) -> None:
+        source = _Source([])
+        assert await _collect(_relay(source)) == []
+        assert source.closed
+
+
+# ──────────────────────────────────────────────────────────────
+# Gzip
+# ──────────────────────────────────────────────────────────────
+
+class TestGzipFrames:
+    """Verify gzip_frames produces a valid, incrementally decodable gzip stream."""
+
+    async def test_round_trip(self) -> None:
+        frames = [b"event: status\ndata: {}\n\n", b"event: done\ndata: {}\n\n"]
+        compressed = await _collect(gzip_frames(_Source(frames)()))
+        assert zlib.decompress(b"".join(compressed), 16 + zlib.MAX_WBITS) == b"".join(frames)
+
+    async def test_each_chunk_is_decodable_on_arrival(self) -> None:
+        """Sync flushes let the client decode every frame without waiting for the next."""
+        frames = [b"event: a\ndata: 1\n\n", b"event: b\ndata: 2\n\n"]
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = gzip_frames(_Source(frames)())
+        for frame in frames:
+            assert decoder.decompress(await chunks.__anext__()) == frame
+        await chunks.aclose()
+
+    async def test_closing_gzip_closes_source(self) -> None:
+        source = _Source([b"data: x\n\n"], endless=True)
+        chunks = gzip_frames(source())
+        await chunks.__anext__()
+        await chunks.aclose()
+        assert source.closed
+
+
+# ──────────────────────────────────────────────────────────────
+# Content negotiation
+# ──────────────────────────────────────────────────────────────
+
+class TestAcceptsGzip:
+    """Verify Accept-Encoding parsing honours q-values."""
+
+    @pytest.mark.parametrize("header", [
+        "gzip",
+        "gzip, deflate, br",
+        "br;q=1.0, GZIP;q=0.5",
+        "deflate, *",
+        "x-gzip",
+    ])
+    def test_accepts(self, header: str) -> None:
+        assert accepts_gzip(header)
+
+    @pytest.mark.parametrize("header", [
+        "",
+        "identity",
+        "br, deflate",
+        "gzip;q=0",
+        "gzip; q=0.0, br",
+        "*;q=0",
+        "gzip;q=0, *",
+        "gzip;q=bogus",
+    ])
+    def test_refuses(self, header: str) -> None:
+        assert not accepts_gzip(header)
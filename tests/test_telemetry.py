@@ -10,6 +10,7 @@ from src.telemetry import (
     get_tracer,
     record_mcp_tool_call,
     setup_telemetry,
+    start_agent_span,
     trace_agent,
     trace_workflow,
 )
@@ -42,6 +43,14 @@ class TestTraceWorkflow:
             # Span should have workflow attributes set
             pass  # No exception means success
 
+    def test_trace_workflow_accepts_parent_context(self) -> None:
+        from opentelemetry.propagate import extract
+
+        setup_telemetry("test")
+        parent = extract({"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"})
+        with trace_workflow("wf_parent", "my query", context=parent) as span:
+            assert span is not None
+
 
 class TestTraceAgent:
     """Tests for the trace_agent context manager."""
@@ -57,6 +66,16 @@ class TestTraceAgent:
             pass  # No exception means success
 
 
+class TestStartAgentSpan:
+    """Tests for the start_agent_span helper."""
+
+    def test_start_agent_span_returns_endable_span(self) -> None:
+        setup_telemetry("test")
+        span = start_agent_span("test_agent", executor_id="Researcher")
+        assert span is not None
+        span.end()
+
+
 class TestRecordMcpToolCall:
     """Tests for MCP tool call metric recording."""
 
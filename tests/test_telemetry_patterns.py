@@ -13,12 +13,196 @@ These tests catch the most common telemetry setup mistakes:
 """
 
 import ast
+import functools
+import importlib
+import inspect
 import os
 import re
+import textwrap
+from pathlib import Path
 
 import pytest
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+from tests._literals import find_literals
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def _scan_present(*subdirs: str) -> frozenset[str]:
+    """Slash-separated paths of the files directly inside BASE_DIR's given subdirs."""
+    present = set()
+    for subdir in subdirs:
+        prefix = f"{subdir}/" if subdir else ""
+        try:
+            with os.scandir(BASE_DIR / subdir) as entries:
+                present.update(prefix + e.name for e in entries if e.is_file())
+        except FileNotFoundError:
+            continue
+    return frozenset(present)
+
+
+# Every file these tests may read, listed once at import instead of stat-ing per test
+PRESENT = _scan_present("", "mcp_server", "web_ui", "otel-collector")
+
+
+@functools.lru_cache(maxsize=None)
+def _slurp(relpath: str) -> str:
+    """Read a repository file (slash-separated path relative to BASE_DIR).
+
+    Cached: the files don't change during a test session, so each is read once.
+    """
+    if relpath not in PRESENT:
+        pytest.fail(f"{relpath} is missing from the repository", pytrace=False)
+    return (BASE_DIR / relpath).read_text(encoding="utf-8")
+
+
+# Tokens docker-compose.yml must contain for the Aspire Dashboard service
+ASPIRE_COMPOSE_TOKENS = (
+    "aspire-dashboard:",
+    "18888:18888",  # Aspire UI
+    "4317:18889",  # OTLP gRPC: host 4317 → container 18889
+    "DOTNET_DASHBOARD_UNSECURED_ALLOW_ANONYMOUS=true",  # anonymous access in dev
+)
+
+# Tokens web_ui/telemetry.js must contain
+BROWSER_TELEMETRY_TOKENS = (
+    "travel-planner-web-ui",  # service name
+    "/otlp/v1/traces",  # export endpoint behind the Nginx proxy
+    "traceparent",  # propagated on fetch calls to /api/
+    "/api/",  # only API calls get traceparent (not /otlp/, avoids loops)
+    "resourceSpans",  # OTLP JSON format
+)
+
+# Literal tokens the pattern tests look for, per file. Each file is scanned
+# once for all of its tokens (see _has).
+TOKENS = {
+    "docker-compose.yml": (
+        *ASPIRE_COMPOSE_TOKENS,
+        "OTEL_SERVICE_NAME=travel-mcp-tools",
+        "aspire-dashboard:18889",
+        "depends_on",
+        "otel-collector:",
+    ),
+    "api.py": (
+        "FastAPIInstrumentor",
+        "FastAPIInstrumentor.instrument_app(",
+        "setup_telemetry(",
+        "shutdown_telemetry()",
+        "trace_workflow",
+    ),
+    "web_ui/telemetry.js": (
+        *BROWSER_TELEMETRY_TOKENS,
+        "spanBuffer",
+        "FLUSH_INTERVAL",
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _hits(relpath: str) -> frozenset[str]:
+    """TOKENS present in a file, found in one pass over its text."""
+    return find_literals(_slurp(relpath), TOKENS.get(relpath, ()))
+
+
+def _has(relpath: str, token: str) -> bool:
+    """Whether a file contains `token`.
+
+    Tokens listed in TOKENS come from the shared one-pass scan; any other
+    token is searched for directly, so a missing TOKENS entry cannot fail a
+    check whose token is present.
+    """
+    if token in TOKENS.get(relpath, ()):
+        return token in _hits(relpath)
+    return token in _slurp(relpath)
+
+
+@functools.lru_cache(maxsize=None)
+def _ast(relpath: str) -> ast.Module:
+    """Parse a repository Python file once per session."""
+    return ast.parse(_slurp(relpath), filename=relpath)
+
+
+# Statements whose relative order matters: the load_dotenv() call and imports
+# of modules that read OTEL_* variables. Anchored at line start so indented
+# code, comments and most prose don't match.
+_ORDER_RE = re.compile(
+    r"^(?:(load_dotenv)\(\)|(?:from|import)\s+(agent_framework|src\.telemetry|opentelemetry))",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _first_lines(relpath: str) -> dict[str, int]:
+    """Line of the first load_dotenv() call and first import of each tracked module.
+
+    Keys are "load_dotenv" and the module prefixes in _ORDER_RE; one pass
+    over the file serves every ordering check.
+    """
+    source = _slurp(relpath)
+    lines: dict[str, int] = {}
+    for match in _ORDER_RE.finditer(source):
+        key = match.group(1) or match.group(2)
+        if key not in lines:
+            lines[key] = source.count("\n", 0, match.start()) + 1
+    return lines
+
+
+@functools.lru_cache(maxsize=None)
+def _method_calls(qualname: str) -> frozenset[str]:
+    """Names of the methods a function calls as `obj.name(...)`, e.g. {"force_flush"}.
+
+    Parsed from the function's own source, so names that only appear in
+    comments or strings (such as hasattr() arguments) don't count, and bare
+    `name(...)` calls to plain functions don't count either.
+    """
+    module_name, fn_name = qualname.rsplit(".", 1)
+    fn = getattr(importlib.import_module(module_name), fn_name)
+    tree = ast.parse(textwrap.dedent(inspect.getsource(fn)))
+    calls = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            calls.add(node.func.attr)
+    return frozenset(calls)
+
+
+# ──────────────────────────────────────────────────────────────
+# Fixtures (web_ui/nginx.conf comes from conftest's nginx_conf)
+# ──────────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="session")
+def main_src() -> str:
+    """main.py text, read once per test session."""
+    return _slurp("main.py")
+
+
+@pytest.fixture(scope="session")
+def requirements_src() -> str:
+    """requirements.txt text, read once per test session."""
+    return _slurp("requirements.txt")
+
+
+@pytest.fixture(scope="session")
+def env_example_src() -> str:
+    """.env.example text, read once per test session."""
+    return _slurp(".env.example")
+
+
+@pytest.fixture(scope="session")
+def mcp_requirements_src() -> str:
+    """mcp_server/requirements.txt text, read once per test session."""
+    return _slurp("mcp_server/requirements.txt")
+
+
+@pytest.fixture(scope="session")
+def mcp_dockerfile_src() -> str:
+    """mcp_server/Dockerfile text, read once per test session."""
+    return _slurp("mcp_server/Dockerfile")
+
+
+@pytest.fixture(scope="session")
+def collector_config_src() -> str:
+    """The OTel Collector config text, read once per test session."""
+    return _slurp("otel-collector/otel-collector-config.yaml")
 
 
 class TestLoadDotenvPattern:
@@ -29,39 +213,33 @@ class TestLoadDotenvPattern:
     to send data (the endpoint defaults to None and no data is exported).
     """
 
-    def _read_main(self) -> str:
-        path = os.path.join(BASE_DIR, "main.py")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def test_load_dotenv_is_called(self) -> None:
+    def test_load_dotenv_is_called(self, main_src: str) -> None:
         """main.py must call load_dotenv()."""
-        source = self._read_main()
-        assert "load_dotenv()" in source, (
+        assert "load_dotenv()" in main_src, (
             "main.py must call load_dotenv() to load .env variables"
         )
 
     def test_load_dotenv_before_maf_imports(self) -> None:
         """load_dotenv() must appear before any 'from agent_framework' import."""
-        source = self._read_main()
-        dotenv_pos = source.find("load_dotenv()")
-        maf_pos = source.find("from agent_framework")
-        assert dotenv_pos != -1, "load_dotenv() not found in main.py"
-        assert maf_pos != -1, "agent_framework import not found in main.py"
-        assert dotenv_pos < maf_pos, (
+        lines = _first_lines("main.py")
+        dotenv_line = lines.get("load_dotenv")
+        maf_line = lines.get("agent_framework")
+        assert dotenv_line is not None, "load_dotenv() not found in main.py"
+        assert maf_line is not None, "agent_framework import not found in main.py"
+        assert dotenv_line < maf_line, (
             "load_dotenv() must be called BEFORE any agent_framework imports. "
-            f"Found load_dotenv() at position {dotenv_pos}, "
-            f"but agent_framework import at {maf_pos}"
+            f"Found load_dotenv() on line {dotenv_line}, "
+            f"but agent_framework import on line {maf_line}"
         )
 
     def test_load_dotenv_before_otel_imports(self) -> None:
         """load_dotenv() must appear before any telemetry setup import."""
-        source = self._read_main()
-        dotenv_pos = source.find("load_dotenv()")
-        telemetry_pos = source.find("from src.telemetry")
-        assert dotenv_pos != -1, "load_dotenv() not found in main.py"
-        assert telemetry_pos != -1, "src.telemetry import not found in main.py"
-        assert dotenv_pos < telemetry_pos, (
+        lines = _first_lines("main.py")
+        dotenv_line = lines.get("load_dotenv")
+        telemetry_line = lines.get("src.telemetry")
+        assert dotenv_line is not None, "load_dotenv() not found in main.py"
+        assert telemetry_line is not None, "src.telemetry import not found in main.py"
+        assert dotenv_line < telemetry_line, (
             "load_dotenv() must be called BEFORE importing src.telemetry"
         )
 
@@ -80,46 +258,37 @@ class TestShutdownTelemetryPattern:
 
     def test_shutdown_telemetry_has_force_flush(self) -> None:
         """shutdown_telemetry must call force_flush to export buffered spans."""
-        import inspect
-        from src.telemetry import shutdown_telemetry
-        source = inspect.getsource(shutdown_telemetry)
-        assert "force_flush" in source, (
+        assert "force_flush" in _method_calls("src.telemetry.shutdown_telemetry"), (
             "shutdown_telemetry() must call force_flush() on providers"
         )
 
     def test_shutdown_telemetry_has_shutdown(self) -> None:
         """shutdown_telemetry must call shutdown() on providers."""
-        import inspect
-        from src.telemetry import shutdown_telemetry
-        source = inspect.getsource(shutdown_telemetry)
-        assert ".shutdown()" in source, (
+        assert "shutdown" in _method_calls("src.telemetry.shutdown_telemetry"), (
             "shutdown_telemetry() must call shutdown() on providers"
         )
 
-    def test_main_calls_shutdown_telemetry(self) -> None:
+    def test_main_calls_shutdown_telemetry(self, main_src: str) -> None:
         """main.py must call shutdown_telemetry() to flush during exit."""
-        path = os.path.join(BASE_DIR, "main.py")
-        with open(path, encoding="utf-8") as f:
-            source = f.read()
-        assert "shutdown_telemetry()" in source, (
+        assert "shutdown_telemetry()" in main_src, (
             "main.py must call shutdown_telemetry() before process exit"
         )
 
-    def test_main_imports_shutdown_telemetry(self) -> None:
+    def test_main_imports_shutdown_telemetry(self, main_src: str) -> None:
         """main.py must import shutdown_telemetry from src.telemetry."""
-        path = os.path.join(BASE_DIR, "main.py")
-        with open(path, encoding="utf-8") as f:
-            source = f.read()
-        assert "shutdown_telemetry" in source
+        assert "shutdown_telemetry" in main_src
         # Verify it's imported, not just mentioned in a comment
-        tree = ast.parse(source)
+        # Imports in main.py are module-level, so top-level statements suffice
         imported = False
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
-                if node.module and "telemetry" in node.module:
-                    for alias in node.names:
-                        if alias.name == "shutdown_telemetry":
-                            imported = True
+        for node in _ast("main.py").body:
+            if (
+                isinstance(node, ast.ImportFrom)
+                and node.module
+                and "telemetry" in node.module
+                and any(alias.name == "shutdown_telemetry" for alias in node.names)
+            ):
+                imported = True
+                break
         assert imported, (
             "shutdown_telemetry must be imported from src.telemetry in main.py"
         )
@@ -133,12 +302,9 @@ class TestOtlpExporterPackage:
     creates no-op exporters and no data reaches the backend.
     """
 
-    def test_otlp_grpc_exporter_in_requirements(self) -> None:
+    def test_otlp_grpc_exporter_in_requirements(self, requirements_src: str) -> None:
         """requirements.txt must include the OTLP gRPC exporter."""
-        path = os.path.join(BASE_DIR, "requirements.txt")
-        with open(path, encoding="utf-8") as f:
-            content = f.read()
-        assert "opentelemetry-exporter-otlp-proto-grpc" in content, (
+        assert "opentelemetry-exporter-otlp-proto-grpc" in requirements_src, (
             "requirements.txt must include opentelemetry-exporter-otlp-proto-grpc. "
             "Without it, MAF's configure_otel_providers() creates no-op exporters."
         )
@@ -151,55 +317,23 @@ class TestAspireDashboardConfig:
     18890 for HTTP). The host ports 4317/4318 must map to those internal ports.
     """
 
-    def _read_compose(self) -> str:
-        path = os.path.join(BASE_DIR, "docker-compose.yml")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def test_aspire_dashboard_service_exists(self) -> None:
-        content = self._read_compose()
-        assert "aspire-dashboard:" in content
-
-    def test_aspire_ui_port(self) -> None:
-        """Aspire UI must be accessible on port 18888."""
-        content = self._read_compose()
-        assert "18888:18888" in content, "Aspire UI port mapping is missing"
-
-    def test_aspire_otlp_grpc_port(self) -> None:
-        """Host port 4317 must map to Aspire's internal gRPC port 18889."""
-        content = self._read_compose()
-        assert "4317:18889" in content, (
-            "OTLP gRPC port must map host 4317 → container 18889"
+    @pytest.mark.parametrize("token", ASPIRE_COMPOSE_TOKENS)
+    def test_compose_contains(self, token: str) -> None:
+        assert _has("docker-compose.yml", token), (
+            f"docker-compose.yml must contain {token!r}"
         )
 
-    def test_aspire_anonymous_access(self) -> None:
-        """Aspire must allow anonymous access in dev mode."""
-        content = self._read_compose()
-        assert "DOTNET_DASHBOARD_UNSECURED_ALLOW_ANONYMOUS=true" in content
-
 
 class TestEnvConfiguration:
     """Ensure .env.example has the required OTEL variables."""
 
-    def _read_env_example(self) -> str:
-        path = os.path.join(BASE_DIR, ".env.example")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def test_otel_endpoint_configured(self) -> None:
-        """Must use OTEL_EXPORTER_OTLP_ENDPOINT (base, not signal-specific)."""
-        content = self._read_env_example()
-        assert "OTEL_EXPORTER_OTLP_ENDPOINT" in content
-
-    def test_otel_protocol_configured(self) -> None:
-        """Must specify gRPC protocol for Aspire Dashboard."""
-        content = self._read_env_example()
-        assert "OTEL_EXPORTER_OTLP_PROTOCOL" in content
-
-    def test_otel_service_name_configured(self) -> None:
-        """Must set a service name for telemetry identification."""
-        content = self._read_env_example()
-        assert "OTEL_SERVICE_NAME" in content
+    @pytest.mark.parametrize("name", [
+        "OTEL_EXPORTER_OTLP_ENDPOINT",  # base endpoint, not signal-specific
+        "OTEL_EXPORTER_OTLP_PROTOCOL",  # gRPC for Aspire Dashboard
+        "OTEL_SERVICE_NAME",
+    ])
+    def test_env_example_contains(self, env_example_src: str, name: str) -> None:
+        assert name in env_example_src, f".env.example must set {name}"
 
 
 class TestMcpServerTelemetryConfig:
@@ -211,51 +345,32 @@ class TestMcpServerTelemetryConfig:
     Docker internal network (not localhost).
     """
 
-    def _read_mcp_requirements(self) -> str:
-        path = os.path.join(BASE_DIR, "mcp_server", "requirements.txt")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def _read_mcp_dockerfile(self) -> str:
-        path = os.path.join(BASE_DIR, "mcp_server", "Dockerfile")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def _read_compose(self) -> str:
-        path = os.path.join(BASE_DIR, "docker-compose.yml")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
     # ── MCP requirements.txt ──────────────────────────────────
 
-    def test_otel_distro_in_mcp_requirements(self) -> None:
+    def test_otel_distro_in_mcp_requirements(self, mcp_requirements_src: str) -> None:
         """MCP server must include opentelemetry-distro for auto-instrumentation."""
-        content = self._read_mcp_requirements()
-        assert "opentelemetry-distro" in content, (
+        assert "opentelemetry-distro" in mcp_requirements_src, (
             "mcp_server/requirements.txt must include opentelemetry-distro"
         )
 
-    def test_otel_exporter_in_mcp_requirements(self) -> None:
+    def test_otel_exporter_in_mcp_requirements(self, mcp_requirements_src: str) -> None:
         """MCP server must include opentelemetry-exporter-otlp for export."""
-        content = self._read_mcp_requirements()
-        assert "opentelemetry-exporter-otlp" in content, (
+        assert "opentelemetry-exporter-otlp" in mcp_requirements_src, (
             "mcp_server/requirements.txt must include opentelemetry-exporter-otlp"
         )
 
     # ── MCP Dockerfile ────────────────────────────────────────
 
-    def test_dockerfile_runs_bootstrap(self) -> None:
+    def test_dockerfile_runs_bootstrap(self, mcp_dockerfile_src: str) -> None:
         """Dockerfile must run opentelemetry-bootstrap to install instrumentations."""
-        content = self._read_mcp_dockerfile()
-        assert "opentelemetry-bootstrap" in content, (
+        assert "opentelemetry-bootstrap" in mcp_dockerfile_src, (
             "Dockerfile must run 'opentelemetry-bootstrap -a install' "
             "to auto-detect and install instrumentations (Starlette, uvicorn)"
         )
 
-    def test_dockerfile_uses_otel_instrument_cmd(self) -> None:
+    def test_dockerfile_uses_otel_instrument_cmd(self, mcp_dockerfile_src: str) -> None:
         """Dockerfile CMD must use opentelemetry-instrument wrapper."""
-        content = self._read_mcp_dockerfile()
-        assert "opentelemetry-instrument" in content, (
+        assert "opentelemetry-instrument" in mcp_dockerfile_src, (
             "Dockerfile CMD must use 'opentelemetry-instrument' to enable "
             "auto-instrumentation at runtime"
         )
@@ -264,23 +379,20 @@ class TestMcpServerTelemetryConfig:
 
     def test_mcp_service_has_otel_service_name(self) -> None:
         """MCP server must have OTEL_SERVICE_NAME set in docker-compose."""
-        content = self._read_compose()
-        assert "OTEL_SERVICE_NAME=travel-mcp-tools" in content, (
+        assert _has("docker-compose.yml", "OTEL_SERVICE_NAME=travel-mcp-tools"), (
             "docker-compose.yml must set OTEL_SERVICE_NAME for the MCP server"
         )
 
     def test_mcp_service_has_otel_endpoint(self) -> None:
         """MCP server must export to Aspire via Docker internal network."""
-        content = self._read_compose()
-        assert "aspire-dashboard:18889" in content, (
+        assert _has("docker-compose.yml", "aspire-dashboard:18889"), (
             "MCP server's OTEL_EXPORTER_OTLP_ENDPOINT must point to "
             "aspire-dashboard:18889 (Docker internal network)"
         )
 
     def test_mcp_service_depends_on_aspire(self) -> None:
         """MCP server must depend on aspire-dashboard to ensure start order."""
-        content = self._read_compose()
-        assert "depends_on" in content, (
+        assert _has("docker-compose.yml", "depends_on"), (
             "MCP server should depend on aspire-dashboard in docker-compose"
         )
 
@@ -296,59 +408,43 @@ class TestApiTelemetryPatterns:
     HTTP spans appear in the Aspire Dashboard alongside workflow spans.
     """
 
-    def _read_api(self) -> str:
-        path = os.path.join(BASE_DIR, "api.py")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def _read_requirements(self) -> str:
-        path = os.path.join(BASE_DIR, "requirements.txt")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def test_fastapi_instrumentation_in_requirements(self) -> None:
+    def test_fastapi_instrumentation_in_requirements(self, requirements_src: str) -> None:
         """requirements.txt must include opentelemetry-instrumentation-fastapi."""
-        content = self._read_requirements()
-        assert "opentelemetry-instrumentation-fastapi" in content, (
+        assert "opentelemetry-instrumentation-fastapi" in requirements_src, (
             "requirements.txt must include opentelemetry-instrumentation-fastapi "
             "for automatic HTTP span creation"
         )
 
     def test_api_imports_fastapi_instrumentor(self) -> None:
         """api.py must import FastAPIInstrumentor."""
-        source = self._read_api()
-        assert "FastAPIInstrumentor" in source
+        assert _has("api.py", "FastAPIInstrumentor")
 
     def test_api_instruments_app(self) -> None:
-        """api.py must call FastAPIInstrumentor.instrument_app(app)."""
-        source = self._read_api()
-        assert "FastAPIInstrumentor.instrument_app(app)" in source
+        """api.py must call FastAPIInstrumentor.instrument_app on the app."""
+        assert _has("api.py", "FastAPIInstrumentor.instrument_app(")
 
     def test_api_calls_setup_telemetry(self) -> None:
         """api.py must call setup_telemetry during startup."""
-        source = self._read_api()
-        assert "setup_telemetry(" in source
+        assert _has("api.py", "setup_telemetry(")
 
     def test_api_calls_shutdown_telemetry(self) -> None:
         """api.py must call shutdown_telemetry during shutdown."""
-        source = self._read_api()
-        assert "shutdown_telemetry()" in source
+        assert _has("api.py", "shutdown_telemetry()")
 
     def test_api_load_dotenv_before_otel(self) -> None:
         """load_dotenv() must be called before OTel imports in api.py."""
-        source = self._read_api()
-        dotenv_pos = source.find("load_dotenv()")
-        otel_pos = source.find("opentelemetry")
-        assert dotenv_pos != -1, "load_dotenv() not found in api.py"
-        assert otel_pos != -1, "OpenTelemetry imports not found in api.py"
-        assert dotenv_pos < otel_pos, (
+        lines = _first_lines("api.py")
+        dotenv_line = lines.get("load_dotenv")
+        otel_line = lines.get("opentelemetry")
+        assert dotenv_line is not None, "load_dotenv() not found in api.py"
+        assert otel_line is not None, "OpenTelemetry imports not found in api.py"
+        assert dotenv_line < otel_line, (
             "load_dotenv() must appear BEFORE OpenTelemetry imports in api.py"
         )
 
     def test_api_uses_trace_workflow(self) -> None:
         """api.py must use trace_workflow context manager for request tracing."""
-        source = self._read_api()
-        assert "trace_workflow" in source
+        assert _has("api.py", "trace_workflow")
 
 
 # ──────────────────────────────────────────────────────────────
@@ -363,40 +459,16 @@ class TestBrowserTelemetryPatterns:
     Traces are exported via OTLP/HTTP to the OTel Collector.
     """
 
-    def _read_telemetry_js(self) -> str:
-        path = os.path.join(BASE_DIR, "web_ui", "telemetry.js")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def test_browser_service_name(self) -> None:
-        """Browser telemetry must identify itself with a service name."""
-        source = self._read_telemetry_js()
-        assert "travel-planner-web-ui" in source
-
-    def test_browser_otlp_endpoint(self) -> None:
-        """Traces must be sent to /otlp/v1/traces (Nginx proxy)."""
-        source = self._read_telemetry_js()
-        assert "/otlp/v1/traces" in source
-
-    def test_browser_traceparent_propagation(self) -> None:
-        """Fetch calls to /api/ must include traceparent header."""
-        source = self._read_telemetry_js()
-        assert "traceparent" in source
-
-    def test_browser_only_instruments_api_calls(self) -> None:
-        """Traceparent must NOT be added to /otlp/ calls (avoids loops)."""
-        source = self._read_telemetry_js()
-        assert "/api/" in source
-
-    def test_browser_otlp_json_format(self) -> None:
-        """Spans must be exported using OTLP JSON (resourceSpans)."""
-        source = self._read_telemetry_js()
-        assert "resourceSpans" in source
+    @pytest.mark.parametrize("token", BROWSER_TELEMETRY_TOKENS)
+    def test_telemetry_js_contains(self, token: str) -> None:
+        assert _has("web_ui/telemetry.js", token), (
+            f"web_ui/telemetry.js must contain {token!r}"
+        )
 
     def test_browser_batch_export(self) -> None:
         """Spans should be batched before export."""
-        source = self._read_telemetry_js()
-        assert "spanBuffer" in source or "FLUSH_INTERVAL" in source
+        js = "web_ui/telemetry.js"
+        assert _has(js, "spanBuffer") or _has(js, "FLUSH_INTERVAL")
 
 
 # ──────────────────────────────────────────────────────────────
@@ -411,41 +483,22 @@ class TestOtelCollectorBridge:
     forwards via gRPC to Aspire Dashboard.
     """
 
-    def _read_collector_config(self) -> str:
-        path = os.path.join(BASE_DIR, "otel-collector", "otel-collector-config.yaml")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
-    def _read_compose(self) -> str:
-        path = os.path.join(BASE_DIR, "docker-compose.yml")
-        with open(path, encoding="utf-8") as f:
-            return f.read()
-
     def test_collector_in_compose(self) -> None:
         """docker-compose.yml must include otel-collector service."""
-        content = self._read_compose()
-        assert "otel-collector:" in content
-
-    def test_collector_cors_enabled(self) -> None:
-        """Collector must have CORS configured for browser access."""
-        config = self._read_collector_config()
-        assert "cors" in config
-        assert "allowed_origins" in config
-
-    def test_collector_exports_to_aspire(self) -> None:
-        """Collector must forward traces to Aspire Dashboard."""
-        config = self._read_collector_config()
-        assert "aspire-dashboard" in config
-
-    def test_collector_traces_pipeline(self) -> None:
-        """Collector must have a traces pipeline defined."""
-        config = self._read_collector_config()
-        assert "traces:" in config
-
-    def test_nginx_proxies_otlp_to_collector(self) -> None:
+        assert _has("docker-compose.yml", "otel-collector:")
+
+    @pytest.mark.parametrize("token", [
+        "cors",  # CORS for browser access
+        "allowed_origins",
+        "aspire-dashboard",  # forwards traces to Aspire Dashboard
+        "traces:",  # traces pipeline
+    ])
+    def test_collector_config_contains(self, collector_config_src: str, token: str) -> None:
+        assert token in collector_config_src, (
+            f"otel-collector-config.yaml must contain {token!r}"
+        )
+
+    def test_nginx_proxies_otlp_to_collector(self, nginx_conf: bytes) -> None:
         """Nginx must proxy /otlp/ requests to the Collector."""
-        path = os.path.join(BASE_DIR, "web_ui", "nginx.conf")
-        with open(path, encoding="utf-8") as f:
-            nginx = f.read()
-        assert "otel-collector" in nginx
-        assert "/otlp/" in nginx
+        assert b"otel-collector" in nginx_conf
+        assert b"/otlp/" in nginx_conf
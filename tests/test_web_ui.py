@@ -4,49 +4,35 @@ Web UI Tests
 Structural and compliance tests for the web UI files (web_ui/).
 Validates HTML structure, JavaScript patterns, CSS existence,
 Nginx configuration, and Dockerfile correctness.
-"""
-
-import os
-
-import pytest
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-WEB_UI_DIR = os.path.join(BASE_DIR, "web_ui")
-
-
-# ──────────────────────────────────────────────────────────────
-# Helpers
-# ──────────────────────────────────────────────────────────────
-
-def _read_file(filename: str) -> str:
-    """Read a file from web_ui/ directory."""
-    path = os.path.join(WEB_UI_DIR, filename)
-    with open(path, encoding="utf-8") as f:
-        return f.read()
-
-
-def _read_index() -> str:
-    return _read_file("index.html")
-
 
-def _read_app_js() -> str:
-    return _read_file("app.js")
+Under pytest-xdist, run with ``--dist=loadfile`` so this module stays on
+one worker and the web UI files are read and scanned once:
 
+    pytest -n auto --dist=loadfile tests/test_web_ui.py
+"""
 
-def _read_telemetry_js() -> str:
-    return _read_file("telemetry.js")
-
+import functools
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable
 
-def _read_nginx_conf() -> str:
-    return _read_file("nginx.conf")
+import pytest
 
+from tests._literals import find_literals
 
-def _read_dockerfile() -> str:
-    return _read_file("Dockerfile")
+# Structural patterns, compiled once at import
+_DOCTYPE_RE = re.compile(rb"<!DOCTYPE html>", re.I)
+_SCRIPT_ORDER_RE = re.compile(rb'src="(telemetry|app)\.js"')  # both tags, in document order
+_KEYFRAMES_RE = re.compile(rb"@keyframes\s+\w+")
 
 
-def _read_style_css() -> str:
-    return _read_file("style.css")
+# Session-scoped so it runs before the session fixtures that read web_ui/ files
+@pytest.fixture(scope="session", autouse=True)
+def _require_web_ui(web_ui_dir: Path) -> None:
+    """Skip this module's tests when conftest's web_ui/ directory is not present."""
+    if not web_ui_dir.is_dir():
+        pytest.skip("web_ui/ not present")
 
 
 # ──────────────────────────────────────────────────────────────
@@ -64,88 +50,188 @@ class TestWebUIFileStructure:
         "nginx.conf",
         "Dockerfile",
     ])
-    def test_file_exists(self, filename: str) -> None:
-        path = os.path.join(WEB_UI_DIR, filename)
-        assert os.path.isfile(path), f"web_ui/{filename} must exist"
+    def test_file_exists(self, web_ui_entries: frozenset[str], filename: str) -> None:
+        assert filename in web_ui_entries, f"web_ui/{filename} must exist"
 
 
 # ──────────────────────────────────────────────────────────────
-# HTML Structure (index.html)
+# Required Literals
 # ──────────────────────────────────────────────────────────────
 
-class TestIndexHtml:
-    """Verify HTML structure and required elements."""
-
-    def test_has_doctype(self) -> None:
-        html = _read_index()
-        assert "<!DOCTYPE html>" in html
-
-    def test_has_lang_attribute(self) -> None:
-        html = _read_index()
-        assert 'lang="en"' in html
-
-    def test_includes_style_css(self) -> None:
-        html = _read_index()
-        assert 'href="style.css"' in html
-
-    def test_includes_telemetry_js(self) -> None:
-        html = _read_index()
-        assert 'src="telemetry.js"' in html
-
-    def test_includes_app_js(self) -> None:
-        html = _read_index()
-        assert 'src="app.js"' in html
-
-    def test_telemetry_loads_before_app(self) -> None:
-        """telemetry.js must load before app.js for TravelTelemetry to be available."""
-        html = _read_index()
-        telemetry_pos = html.find('src="telemetry.js"')
-        app_pos = html.find('src="app.js"')
-        assert telemetry_pos != -1, "telemetry.js script tag must exist"
-        assert app_pos != -1, "app.js script tag must exist"
-        assert telemetry_pos < app_pos, "telemetry.js must load BEFORE app.js"
-
-    def test_has_query_form(self) -> None:
-        html = _read_index()
-        assert 'id="query-form"' in html
+# (file, literal, description): one parametrize case per row, with the literal as its id
+CHECKS = [
+    # index.html
+    ("index.html", b'lang="en"', "lang_attribute"),
+    ("index.html", b'href="style.css"', "includes_style_css"),
+    ("index.html", b'src="telemetry.js"', "includes_telemetry_js"),
+    ("index.html", b'src="app.js"', "includes_app_js"),
+    ("index.html", b"Welcome", "welcome_message"),
+    ("index.html", b"Researcher", "agent_researcher"),
+    ("index.html", b"WeatherAnalyst", "agent_weather_analyst"),
+    ("index.html", b"Planner", "agent_planner"),
+    # app.js
+    ("app.js", b"API_BASE", "api_base"),
+    ("app.js", b"HISTORY_KEY", "history_key"),
+    ("app.js", b"MAX_HISTORY", "max_history"),
+    ("app.js", b"AGENT_CONFIG", "agent_config"),
+    ("app.js", b"Researcher", "agent_researcher"),
+    ("app.js", b"WeatherAnalyst", "agent_weather_analyst"),
+    ("app.js", b"Planner", "agent_planner"),
+    # SSE via POST-based fetch (not EventSource which only supports GET)
+    ("app.js", b"method: 'POST'", "post_method"),
+    ("app.js", b"'Content-Type': 'application/json'", "json_content_type"),
+    ("app.js", b"getReader()", "readable_stream"),
+    ("app.js", b"event:", "sse_event_field"),
+    ("app.js", b"data:", "sse_data_field"),
+    ("app.js", b"localStorage", "localstorage_history"),
+    ("app.js", b"saveToHistory", "save_to_history"),
+    ("app.js", b"loadHistory", "load_history"),
+    ("app.js", b"escapeHtml", "escape_html"),
+    ("app.js", b"handleSubmit", "handle_submit"),
+    ("app.js", b"streamWorkflow", "stream_workflow"),
+    ("app.js", b"handleSSEEvent", "handle_sse_event"),
+    ("app.js", b"TravelTelemetry", "travel_telemetry"),
+    ("app.js", b"user.submit_query", "user_submit_span"),
+    ("app.js", b"ui.stream_started", "stream_started_span"),
+    ("app.js", b"ui.stream_complete", "stream_complete_span"),
+    # completedAgents drives the step progress display
+    ("app.js", b"completedAgents", "completed_agents"),
+    # telemetry.js
+    ("telemetry.js", b"travel-planner-web-ui", "service_name"),
+    ("telemetry.js", b"/otlp/v1/traces", "otlp_endpoint"),
+    ("telemetry.js", b"traceparent", "traceparent"),
+    # Fetch must be instrumented to inject traceparent on /api/ calls only
+    ("telemetry.js", b"window.fetch", "patches_window_fetch"),
+    ("telemetry.js", b"originalFetch", "keeps_original_fetch"),
+    ("telemetry.js", b"/api/", "instruments_api_calls"),
+    ("telemetry.js", b"TravelTelemetry", "travel_telemetry_global"),
+    ("telemetry.js", b"startSpan", "start_span"),
+    ("telemetry.js", b"flushSpans", "flush_spans"),
+    # Spans are exported as OTLP JSON (resourceSpans format)
+    ("telemetry.js", b"resourceSpans", "otlp_json_format"),
+    ("telemetry.js", b"service.name", "resource_service_name"),
+    ("telemetry.js", b"service.version", "resource_service_version"),
+    ("telemetry.js", b"spanBuffer", "batch_buffer"),
+    # W3C trace context format: 00-{traceId}-{spanId}-{flags}
+    ("telemetry.js", b"00-", "w3c_trace_format"),
+    # nginx.conf
+    ("nginx.conf", b"listen 80", "listens_on_port_80"),
+    ("nginx.conf", b"/usr/share/nginx/html", "serves_static_files"),
+    ("nginx.conf", b"location /api/", "api_proxy"),
+    ("nginx.conf", b"host.docker.internal:8000", "api_proxy_target"),
+    # SSE requires proxy_buffering off
+    ("nginx.conf", b"proxy_buffering off", "api_proxy_disables_buffering"),
+    # SLM inference can be slow — need long timeouts
+    ("nginx.conf", b"proxy_read_timeout", "api_proxy_long_timeout"),
+    ("nginx.conf", b"location /otlp/", "otlp_proxy"),
+    ("nginx.conf", b"otel-collector:4319", "otlp_proxy_target"),
+    # Dockerfile
+    ("Dockerfile", b"nginx:alpine", "nginx_alpine"),
+    ("Dockerfile", b"COPY index.html", "copies_html"),
+    ("Dockerfile", b"COPY app.js", "copies_app_js"),
+    ("Dockerfile", b"COPY telemetry.js", "copies_telemetry_js"),
+    ("Dockerfile", b"COPY style.css", "copies_style_css"),
+    ("Dockerfile", b"COPY nginx.conf", "copies_nginx_conf"),
+    ("Dockerfile", b"rm -rf /usr/share/nginx/html", "removes_default_content"),
+]
+
+# Each file's distinct literals, so every literal is scanned for once per file
+PER_FILE_NEEDLES = {
+    filename: frozenset(n for f, n, _ in CHECKS if f == filename)
+    for filename in dict.fromkeys(f for f, _, _ in CHECKS)
+}
+
+INDEX_HTML_IDS = [
+    "query-form",
+    "query-input",
+    "messages",
+    "agent-progress",
+    "history-list",
+    "submit-btn",
+    "sidebar",
+    "connection-status",
+]
+
+
+@pytest.fixture(scope="session")
+def web_ui_missing(web_ui_file: Callable[[str], bytes]) -> Callable[[str], frozenset[bytes]]:
+    """Literals from CHECKS absent from a file, scanned on first use per file."""
+    def missing(filename: str) -> frozenset[bytes]:
+        needles = PER_FILE_NEEDLES[filename]
+        return needles - find_literals(web_ui_file(filename), needles)
+
+    return functools.cache(missing)
+
+
+class _IdCollector(HTMLParser):
+    """Collects the id attribute of every element in an HTML document."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ids: set[str] = set()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        for name, value in attrs:
+            if name == "id" and value:
+                self.ids.add(value)
+
+
+@pytest.fixture(scope="session")
+def index_ids(index_html: bytes) -> frozenset[str]:
+    """Element ids in index.html, from a single parse."""
+    parser = _IdCollector()
+    parser.feed(index_html.decode("utf-8"))
+    parser.close()
+    return frozenset(parser.ids)
 
-    def test_has_query_input(self) -> None:
-        html = _read_index()
-        assert 'id="query-input"' in html
 
-    def test_has_messages_container(self) -> None:
-        html = _read_index()
-        assert 'id="messages"' in html
+# ──────────────────────────────────────────────────────────────
+# Required Literals (all files)
+# ──────────────────────────────────────────────────────────────
 
-    def test_has_agent_progress(self) -> None:
-        html = _read_index()
-        assert 'id="agent-progress"' in html
+class TestWebUIContents:
+    """Verify each web UI file contains the literals listed in CHECKS."""
+
+    @pytest.mark.parametrize(
+        "filename, needle, description",
+        CHECKS,
+        ids=[f"{f}::{n.decode()[:40]}" for f, n, _ in CHECKS],
+    )
+    def test_web_ui_contains(
+        self,
+        web_ui_missing: Callable[[str], frozenset[bytes]],
+        filename: str,
+        needle: bytes,
+        description: str,
+    ) -> None:
+        missing = web_ui_missing(filename)
+        assert needle not in missing, (
+            f"{filename} must contain {needle!r} [{description}] (missing: {sorted(missing)})"
+        )
 
-    def test_has_history_list(self) -> None:
-        html = _read_index()
-        assert 'id="history-list"' in html
 
-    def test_has_submit_button(self) -> None:
-        html = _read_index()
-        assert 'id="submit-btn"' in html
+# ──────────────────────────────────────────────────────────────
+# HTML Structure (index.html)
+# ──────────────────────────────────────────────────────────────
 
-    def test_has_sidebar(self) -> None:
-        html = _read_index()
-        assert 'id="sidebar"' in html
+class TestIndexHtml:
+    """Verify HTML structure and required elements."""
 
-    def test_has_connection_status(self) -> None:
-        html = _read_index()
-        assert 'id="connection-status"' in html
+    @pytest.mark.parametrize("element_id", INDEX_HTML_IDS)
+    def test_index_html_has_element(self, index_ids: frozenset[str], element_id: str) -> None:
+        assert element_id in index_ids, (
+            f'index.html must have an element with id="{element_id}" (ids: {sorted(index_ids)})'
+        )
 
-    def test_has_welcome_message(self) -> None:
-        html = _read_index()
-        assert "Welcome" in html
+    def test_has_doctype(self, index_html: bytes) -> None:
+        assert _DOCTYPE_RE.search(index_html), "index.html must declare <!DOCTYPE html>"
 
-    def test_lists_all_three_agents(self) -> None:
-        html = _read_index()
-        assert "Researcher" in html
-        assert "WeatherAnalyst" in html
-        assert "Planner" in html
+    def test_telemetry_loads_before_app(self, index_html: bytes) -> None:
+        """telemetry.js must load before app.js for TravelTelemetry to be available."""
+        scripts = _SCRIPT_ORDER_RE.findall(index_html)
+        assert b"telemetry" in scripts, "telemetry.js script tag must exist"
+        assert b"app" in scripts, "app.js script tag must exist"
+        assert scripts == [b"telemetry", b"app"], "telemetry.js must load BEFORE app.js"
 
 
 # ──────────────────────────────────────────────────────────────
@@ -155,45 +241,6 @@ class TestIndexHtml:
 class TestAppJs:
     """Verify app.js implements required functionality."""
 
-    def test_defines_api_base(self) -> None:
-        js = _read_app_js()
-        assert "API_BASE" in js
-
-    def test_defines_history_key(self) -> None:
-        js = _read_app_js()
-        assert "HISTORY_KEY" in js
-
-    def test_defines_max_history(self) -> None:
-        js = _read_app_js()
-        assert "MAX_HISTORY" in js
-
-    def test_defines_agent_config(self) -> None:
-        js = _read_app_js()
-        assert "AGENT_CONFIG" in js
-
-    @pytest.mark.parametrize("agent", ["Researcher", "WeatherAnalyst", "Planner"])
-    def test_agent_config_has_all_agents(self, agent: str) -> None:
-        js = _read_app_js()
-        assert agent in js
-
-    def test_uses_post_method_for_api(self) -> None:
-        """SSE via POST-based fetch (not EventSource which only supports GET)."""
-        js = _read_app_js()
-        assert "method: 'POST'" in js
-
-    def test_sends_json_content_type(self) -> None:
-        js = _read_app_js()
-        assert "'Content-Type': 'application/json'" in js
-
-    def test_uses_readable_stream(self) -> None:
-        js = _read_app_js()
-        assert "getReader()" in js
-
-    def test_parses_sse_events(self) -> None:
-        js = _read_app_js()
-        assert "event:" in js
-        assert "data:" in js
-
     @pytest.mark.parametrize("event_type", [
         "agent_started",
         "agent_completed",
@@ -203,210 +250,19 @@ class TestAppJs:
         "done",
         "status",
     ])
-    def test_handles_sse_event_type(self, event_type: str) -> None:
-        js = _read_app_js()
-        assert f"'{event_type}'" in js or f'"{event_type}"' in js, (
+    def test_handles_sse_event_type(self, app_js: bytes, event_type: str) -> None:
+        quoted = (f"'{event_type}'".encode(), f'"{event_type}"'.encode())
+        assert any(q in app_js for q in quoted), (
             f"app.js must handle SSE event type '{event_type}'"
         )
 
-    def test_uses_localstorage_for_history(self) -> None:
-        js = _read_app_js()
-        assert "localStorage" in js
-
-    def test_has_save_to_history(self) -> None:
-        js = _read_app_js()
-        assert "saveToHistory" in js
-
-    def test_has_load_history(self) -> None:
-        js = _read_app_js()
-        assert "loadHistory" in js
-
-    def test_has_escape_html(self) -> None:
-        js = _read_app_js()
-        assert "escapeHtml" in js
-
-    def test_has_handle_submit(self) -> None:
-        js = _read_app_js()
-        assert "handleSubmit" in js
-
-    def test_has_stream_workflow(self) -> None:
-        js = _read_app_js()
-        assert "streamWorkflow" in js
-
-    def test_has_handle_sse_event(self) -> None:
-        js = _read_app_js()
-        assert "handleSSEEvent" in js
-
-    def test_integrates_travel_telemetry(self) -> None:
-        """app.js must use TravelTelemetry for custom spans."""
-        js = _read_app_js()
-        assert "TravelTelemetry" in js
-
-    def test_creates_user_submit_span(self) -> None:
-        js = _read_app_js()
-        assert "user.submit_query" in js
-
-    def test_creates_stream_started_span(self) -> None:
-        js = _read_app_js()
-        assert "ui.stream_started" in js
-
-    def test_creates_stream_complete_span(self) -> None:
-        js = _read_app_js()
-        assert "ui.stream_complete" in js
-
-    def test_tracks_completed_agents(self) -> None:
-        """app.js must track completedAgents for step progress display."""
-        js = _read_app_js()
-        assert "completedAgents" in js
-
-    def test_shows_step_progress(self) -> None:
+    def test_shows_step_progress(self, app_js: bytes) -> None:
         """showProgress must display step numbers (e.g., step 1/3)."""
-        js = _read_app_js()
-        assert "step" in js and "total" in js, (
+        assert b"step" in app_js and b"total" in app_js, (
             "showProgress must accept step/total for numbered progress"
         )
 
 
-# ──────────────────────────────────────────────────────────────
-# Browser Telemetry (telemetry.js)
-# ──────────────────────────────────────────────────────────────
-
-class TestTelemetryJs:
-    """Verify browser telemetry instrumentation."""
-
-    def test_defines_service_name(self) -> None:
-        js = _read_telemetry_js()
-        assert "travel-planner-web-ui" in js
-
-    def test_defines_otlp_endpoint(self) -> None:
-        js = _read_telemetry_js()
-        assert "/otlp/v1/traces" in js
-
-    def test_generates_traceparent(self) -> None:
-        js = _read_telemetry_js()
-        assert "traceparent" in js
-
-    def test_monkey_patches_fetch(self) -> None:
-        """Fetch must be instrumented to inject traceparent on /api/ calls."""
-        js = _read_telemetry_js()
-        assert "window.fetch" in js
-        assert "originalFetch" in js
-
-    def test_only_instruments_api_calls(self) -> None:
-        """Only /api/ calls should be instrumented (not /otlp/)."""
-        js = _read_telemetry_js()
-        assert "/api/" in js
-
-    def test_exports_travel_telemetry_global(self) -> None:
-        js = _read_telemetry_js()
-        assert "TravelTelemetry" in js
-
-    def test_has_start_span_function(self) -> None:
-        js = _read_telemetry_js()
-        assert "startSpan" in js
-
-    def test_has_flush_spans_function(self) -> None:
-        js = _read_telemetry_js()
-        assert "flushSpans" in js
-
-    def test_uses_otlp_json_format(self) -> None:
-        """Spans must be exported using OTLP JSON (resourceSpans format)."""
-        js = _read_telemetry_js()
-        assert "resourceSpans" in js
-
-    def test_includes_resource_attributes(self) -> None:
-        js = _read_telemetry_js()
-        assert "service.name" in js
-        assert "service.version" in js
-
-    def test_has_batch_buffer(self) -> None:
-        js = _read_telemetry_js()
-        assert "spanBuffer" in js
-
-    def test_uses_w3c_trace_format(self) -> None:
-        """W3C trace context format: 00-{traceId}-{spanId}-{flags}."""
-        js = _read_telemetry_js()
-        assert "00-" in js
-
-
-# ──────────────────────────────────────────────────────────────
-# Nginx Configuration
-# ──────────────────────────────────────────────────────────────
-
-class TestNginxConf:
-    """Verify Nginx is configured for static files, API proxy, and OTLP proxy."""
-
-    def test_listens_on_port_80(self) -> None:
-        conf = _read_nginx_conf()
-        assert "listen 80" in conf
-
-    def test_serves_static_files(self) -> None:
-        conf = _read_nginx_conf()
-        assert "/usr/share/nginx/html" in conf
-
-    def test_has_api_proxy(self) -> None:
-        conf = _read_nginx_conf()
-        assert "location /api/" in conf
-
-    def test_api_proxy_target(self) -> None:
-        conf = _read_nginx_conf()
-        assert "host.docker.internal:8000" in conf
-
-    def test_api_proxy_disables_buffering(self) -> None:
-        """SSE requires proxy_buffering off."""
-        conf = _read_nginx_conf()
-        assert "proxy_buffering off" in conf
-
-    def test_api_proxy_has_long_timeout(self) -> None:
-        """SLM inference can be slow — need long timeouts."""
-        conf = _read_nginx_conf()
-        assert "proxy_read_timeout" in conf
-
-    def test_has_otlp_proxy(self) -> None:
-        conf = _read_nginx_conf()
-        assert "location /otlp/" in conf
-
-    def test_otlp_proxy_target(self) -> None:
-        conf = _read_nginx_conf()
-        assert "otel-collector:4319" in conf
-
-
-# ──────────────────────────────────────────────────────────────
-# Web UI Dockerfile
-# ──────────────────────────────────────────────────────────────
-
-class TestWebUIDockerfile:
-    """Verify the web UI Dockerfile is correctly structured."""
-
-    def test_uses_nginx_alpine(self) -> None:
-        df = _read_dockerfile()
-        assert "nginx:alpine" in df
-
-    def test_copies_html(self) -> None:
-        df = _read_dockerfile()
-        assert "COPY index.html" in df
-
-    def test_copies_app_js(self) -> None:
-        df = _read_dockerfile()
-        assert "COPY app.js" in df
-
-    def test_copies_telemetry_js(self) -> None:
-        df = _read_dockerfile()
-        assert "COPY telemetry.js" in df
-
-    def test_copies_style_css(self) -> None:
-        df = _read_dockerfile()
-        assert "COPY style.css" in df
-
-    def test_copies_nginx_conf(self) -> None:
-        df = _read_dockerfile()
-        assert "COPY nginx.conf" in df
-
-    def test_removes_default_nginx_content(self) -> None:
-        df = _read_dockerfile()
-        assert "rm -rf /usr/share/nginx/html" in df
-
-
 # ──────────────────────────────────────────────────────────────
 # Style Sheet
 # ──────────────────────────────────────────────────────────────
@@ -414,17 +270,14 @@ class TestWebUIDockerfile:
 class TestStyleCss:
     """Verify the CSS file has basic styling patterns."""
 
-    def test_has_content(self) -> None:
-        css = _read_style_css()
-        assert len(css) > 100, "style.css should have substantial content"
+    def test_has_content(self, style_css: bytes) -> None:
+        assert len(style_css) > 100, "style.css should have substantial content"
 
-    def test_has_dark_theme_variables(self) -> None:
+    def test_has_dark_theme_variables(self, style_css: bytes) -> None:
         """The UI uses a dark theme with CSS custom properties."""
-        css = _read_style_css()
-        assert "--" in css, "CSS should use custom properties (variables)"
+        assert b"--" in style_css, "CSS should use custom properties (variables)"
 
-    def test_has_message_entrance_animation(self) -> None:
+    def test_has_message_entrance_animation(self, style_css: bytes) -> None:
         """Messages should have an entrance animation for better UX."""
-        css = _read_style_css()
-        assert "@keyframes" in css, "CSS must define keyframe animations for messages"
-        assert "agent-message" in css, "CSS must style agent messages"
+        assert _KEYFRAMES_RE.search(style_css), "CSS must define keyframe animations for messages"
+        assert b"agent-message" in style_css, "CSS must style agent messages"
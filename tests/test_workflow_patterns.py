@@ -47,6 +47,14 @@ class TestSequentialWorkflowPattern:
         assert "weather_analyst" in source
         assert "planner" in source
 
+    def test_llm_only_agents_are_cached(self) -> None:
+        """Researcher and Planner hold no per-request state and must be reused."""
+        source = inspect.getsource(
+            __import__("src.workflows.travel_planner", fromlist=["build_travel_planner_workflow"])
+        )
+        assert "@lru_cache(maxsize=1)" in source
+        assert "_get_llm_only_agents(client)" in source
+
     def test_workflow_returns_tuple(self) -> None:
         """build_travel_planner_workflow should return (workflow, mcp_tool) tuple."""
         from src.workflows.travel_planner import build_travel_planner_workflow